@@ -12,9 +12,12 @@ import psutil
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 import threading
 
+sys.path.append(str(Path(__file__).parent.parent / 'utils'))
+from cpu_sampler import CpuSampler
+
 class DellT710PerformanceMonitor:
     """
     Monitor de rendimiento específico para Dell T710
@@ -33,6 +36,21 @@ class DellT710PerformanceMonitor:
         self.metrics_history = []
         self.max_history_size = 1440  # 24 horas con intervalos de 1 minuto
         
+        # Procesos Python/Chrome seguidos entre muestras:
+        # pid -> (tipo, hora de inicio, Process); el Process se reutiliza para
+        # que cpu_percent() mida desde la muestra anterior
+        self._tracked_procs: Dict[int, Tuple[str, float, psutil.Process]] = {}
+        # PID de la muestra anterior; solo los nuevos se consultan
+        self._seen_pids: Set[int] = set()
+
+        # Última lectura de red (time.monotonic(), bytes_recv, bytes_sent) para
+        # calcular la tasa entre muestras
+        self._prev_net: Optional[Tuple[float, int, int]] = None
+        
+        # Cada muestra mide el uso medio de CPU desde la anterior, sin bloquear
+        # y sin verse afectada por otras lecturas de CPU del proceso
+        self._cpu_sampler = CpuSampler()
+        
         # Thresholds Dell T710
         self.cpu_warning_threshold = 80
         self.cpu_critical_threshold = 90
@@ -74,7 +92,7 @@ class DellT710PerformanceMonitor:
         """Obtener métricas actuales del sistema"""
         try:
             # CPU
-            cpu_percent = psutil.cpu_percent(interval=1)
+            cpu_percent = self._cpu_sampler.percent()
             cpu_count = psutil.cpu_count()
             cpu_freq = psutil.cpu_freq()
             
@@ -88,27 +106,33 @@ class DellT710PerformanceMonitor:
             
             # Red
             net_io = psutil.net_io_counters()
+            recv_rate, sent_rate = self._network_rates(net_io)
             
             # Procesos Python/Chrome (scrapers)
             python_processes = []
             chrome_processes = []
             
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 'cmdline']):
+            # Leer CPU/memoria de los procesos seguidos, en un único
+            # oneshot() por proceso
+            for pid, (kind, create_time, proc) in list(self._refresh_tracked_procs().items()):
                 try:
-                    if 'python' in proc.info['name'].lower():
-                        python_processes.append({
-                            'pid': proc.info['pid'],
-                            'cpu_percent': proc.info['cpu_percent'],
-                            'memory_percent': proc.info['memory_percent'],
-                            'cmdline': ' '.join(proc.info['cmdline'][:3]) if proc.info['cmdline'] else ''
-                        })
-                    elif 'chrome' in proc.info['name'].lower():
-                        chrome_processes.append({
-                            'pid': proc.info['pid'],
-                            'cpu_percent': proc.info['cpu_percent'],
-                            'memory_percent': proc.info['memory_percent']
-                        })
+                    with proc.oneshot():
+                        if kind == 'python':
+                            cmdline = proc.cmdline()
+                            python_processes.append({
+                                'pid': pid,
+                                'cpu_percent': proc.cpu_percent(),
+                                'memory_percent': proc.memory_percent(),
+                                'cmdline': ' '.join(cmdline[:3]) if cmdline else ''
+                            })
+                        else:
+                            chrome_processes.append({
+                                'pid': pid,
+                                'cpu_percent': proc.cpu_percent(),
+                                'memory_percent': proc.memory_percent()
+                            })
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    self._tracked_procs.pop(pid, None)
                     continue
             
             # Sistema general
@@ -144,7 +168,9 @@ class DellT710PerformanceMonitor:
                 },
                 'network': {
                     'bytes_sent_mb': net_io.bytes_sent / (1024**2) if net_io else 0,
-                    'bytes_recv_mb': net_io.bytes_recv / (1024**2) if net_io else 0
+                    'bytes_recv_mb': net_io.bytes_recv / (1024**2) if net_io else 0,
+                    'recv_mb_s': recv_rate,
+                    'sent_mb_s': sent_rate
                 },
                 'processes': {
                     'python_count': len(python_processes),
@@ -160,6 +186,57 @@ class DellT710PerformanceMonitor:
             self.logger.error(f"❌ Error obteniendo métricas: {e}")
             return None
     
+    def _network_rates(self, net_io) -> Tuple[float, float]:
+        """Tasa de recepción/envío en MB/s desde la muestra anterior"""
+        if not net_io:
+            return 0.0, 0.0
+        now = time.monotonic()
+        prev, self._prev_net = self._prev_net, (now, net_io.bytes_recv, net_io.bytes_sent)
+        if prev is None or now <= prev[0]:
+            return 0.0, 0.0
+        elapsed = (now - prev[0]) * (1024**2)
+        # Los contadores pueden reiniciarse (p. ej. al recrear una interfaz)
+        recv_rate = max(net_io.bytes_recv - prev[1], 0) / elapsed
+        sent_rate = max(net_io.bytes_sent - prev[2], 0) / elapsed
+        return recv_rate, sent_rate
+    
+    def _refresh_tracked_procs(self) -> Dict[int, Tuple[str, float, psutil.Process]]:
+        """Actualizar los procesos Python/Chrome seguidos entre muestras
+
+        Solo se consulta el nombre de los PID que no estaban en la muestra
+        anterior; los que ya no existen se olvidan. De los PID ya conocidos
+        solo se comprueban los seguidos, con ``is_running()`` sobre el
+        ``Process`` guardado, que detecta si el PID pasó a otro proceso.
+        """
+        current_pids = set(psutil.pids())
+        for pid in self._seen_pids - current_pids:
+            self._tracked_procs.pop(pid, None)
+
+        new_pids = current_pids - self._seen_pids
+        for pid, (_, _, proc) in list(self._tracked_procs.items()):
+            if not proc.is_running():
+                # PID reutilizado por otro proceso: clasificarlo de nuevo
+                del self._tracked_procs[pid]
+                new_pids.add(pid)
+
+        for pid in new_pids:
+            try:
+                proc = psutil.Process(pid)
+                with proc.oneshot():
+                    name = proc.name().lower()
+                    if 'python' in name:
+                        kind = 'python'
+                    elif 'chrome' in name:
+                        kind = 'chrome'
+                    else:
+                        continue
+                    self._tracked_procs[pid] = (kind, proc.create_time(), proc)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+
+        self._seen_pids = current_pids
+        return self._tracked_procs
+    
     def check_alerts(self, metrics: Dict) -> List[Dict]:
         """Verificar alertas basadas en las métricas"""
         alerts = []
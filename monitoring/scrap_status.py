@@ -3,15 +3,14 @@
 
 The script inspects CSV files in ``URLs/`` to determine all available
 scraping tasks, loading progress metadata such as ``Status``, ``LastRun``
-and ``NextRun`` directly from those files. Based on this information
-tasks are classified into "completed", "running", "queued" and
-"never-run" (no ``LastRun`` value). Results can be filtered and sorted by
-``PaginaWeb`` and ``Ciudad``.
+and ``NextRun`` from those files together with any registry updates not
+yet written back to them. Based on this information tasks are classified
+into "completed", "running", "queued" and "never-run" (no ``LastRun``
+value). Results can be filtered and sorted by ``PaginaWeb`` and ``Ciudad``.
 """
 from __future__ import annotations
 
 import argparse
-import csv
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -21,7 +20,7 @@ import sys
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.append(str(PROJECT_ROOT))
 sys.path.append(str(PROJECT_ROOT / "utils"))
-from enhanced_scraps_registry import EnhancedScrapsRegistry
+from enhanced_scraps_registry import EnhancedScrapsRegistry, get_registry
 URLS_DIR = PROJECT_ROOT / "URLs"
 
 
@@ -50,47 +49,43 @@ class ScrapEntry:
         )
 
 
-def load_urls() -> List[ScrapEntry]:
-    """Load all URL definitions from ``URLs/`` CSV files."""
+def load_urls(registry: Optional[EnhancedScrapsRegistry] = None) -> List[ScrapEntry]:
+    """Load all URL definitions from ``URLs/`` CSV files.
+
+    The rows are read through :class:`EnhancedScrapsRegistry` so that progress
+    updates not yet written back to the CSV files are included.
+    """
     scraps: List[ScrapEntry] = []
     if not URLS_DIR.exists():
         return scraps
 
-    for csv_file in URLS_DIR.glob("*.csv"):
-        with open(csv_file, "r", encoding="utf-8-sig") as f:
-            reader = csv.DictReader(
-                row for row in f if not row.lstrip().startswith("#")
+    if registry is None:
+        registry = get_registry()
+
+    for row in registry.urls_registry:
+        pagina = row.get("website", "")
+        ciudad = row.get("ciudad", "")
+        operacion = row.get("operacion", "")
+        producto = row.get("producto", "")
+        try:
+            records = int(str(row.get("records", "")).strip())
+        except ValueError:
+            records = 0
+        if pagina and ciudad and operacion and producto:
+            scraps.append(
+                ScrapEntry(
+                    pagina_web=pagina,
+                    ciudad=ciudad,
+                    operacion=operacion,
+                    producto=producto,
+                    url=row.get("url", ""),
+                    status=row.get("status", "").strip(),
+                    last_run=row.get("last_run", "").strip(),
+                    next_run=row.get("next_run", "").strip(),
+                    scrap_of_month=row.get("scrap_of_month", "").strip(),
+                    records=records,
+                )
             )
-            for row in reader:
-                pagina = row.get("PaginaWeb", "").strip()
-                ciudad = row.get("Ciudad", "").strip()
-                operacion = row.get("Operacion", row.get("Operación", "")).strip()
-                producto = row.get("ProductoPaginaWeb", "").strip()
-                url = row.get("URL", "").strip()
-                status = row.get("Status", "").strip()
-                last_run = row.get("LastRun", "").strip()
-                next_run = row.get("NextRun", "").strip()
-                scrap_of_month = row.get("ScrapOfMonth", "").strip()
-                records_str = row.get("Records", "").strip()
-                try:
-                    records = int(records_str)
-                except ValueError:
-                    records = 0
-                if pagina and ciudad and operacion and producto:
-                    scraps.append(
-                        ScrapEntry(
-                            pagina_web=pagina,
-                            ciudad=ciudad,
-                            operacion=operacion,
-                            producto=producto,
-                            url=url,
-                            status=status,
-                            last_run=last_run,
-                            next_run=next_run,
-                            scrap_of_month=scrap_of_month,
-                            records=records,
-                        )
-                    )
     return scraps
 
 
@@ -106,7 +101,8 @@ def main() -> None:
     )
     args = parser.parse_args()
 
-    scraps = load_urls()
+    registry = get_registry()
+    scraps = load_urls(registry)
     if args.pagina_web:
         scraps = [s for s in scraps if s.pagina_web.lower() == args.pagina_web.lower()]
     if args.ciudad:
@@ -135,7 +131,6 @@ def main() -> None:
         else:
             queued.append(scrap)
 
-    registry = EnhancedScrapsRegistry()
     som_data = registry.get_scrap_of_month(
         website=args.pagina_web, city=args.ciudad
     )
@@ -24,7 +24,8 @@ import signal
 # Agregar paths del proyecto
 sys.path.append(str(Path(__file__).parent.parent))
 sys.path.append(str(Path(__file__).parent.parent / 'utils'))
-from enhanced_scraps_registry import EnhancedScrapsRegistry
+from enhanced_scraps_registry import get_registry
+from cpu_sampler import CpuSampler
 
 # Importar scrapers específicos (todos aceptan ``output_path``)
 try:
@@ -63,12 +64,15 @@ class AdvancedOrchestrator:
     3. Todos los productos de cada operación
     4. Máximo 4 scrapers paralelos pero en páginas web diferentes
     """
+
+    # Segundos durante los que se reutilizan las estadísticas del registro
+    REGISTRY_STATS_TTL = 5
     
     def __init__(self):
         self.setup_logging()
         
         # Componentes principales
-        self.registry = EnhancedScrapsRegistry()
+        self.registry = get_registry()
         
         # Componentes opcionales
         if backup_available:
@@ -76,14 +80,13 @@ class AdvancedOrchestrator:
         else:
             self.backup_manager = None
             
-        if monitoring_available:
-            self.performance_monitor = DellT710PerformanceMonitor(log_interval=30)
-        else:
-            self.performance_monitor = None
+        # El monitor de rendimiento se crea al iniciar la orquestación; --status
+        # y el modo por lotes no lo usan
+        self.performance_monitor = None
         
         # Estado del orquestador
         self.running = False
-        # {website: {thread, scrap, started_at, result}}
+        # {website: {thread, scrap, started_at, started_mono, result}}
         self.active_scrapers = {}
         self.completed_scrapers = []
         self.failed_scrapers = []
@@ -92,6 +95,9 @@ class AdvancedOrchestrator:
         self.max_concurrent_websites = 4  # Máximo 4 páginas web simultáneas
         self.max_cpu_usage = 80
         self.max_memory_usage = 80
+        # Muestreo de CPU propio: las lecturas de display_progress o del
+        # monitor de rendimiento no acortan la ventana de check_system_resources
+        self._cpu_sampler = CpuSampler()
 
         # Mapear identificadores de sitios web a sus funciones run_scraper
         self.scraper_functions = {
@@ -115,6 +121,12 @@ class AdvancedOrchestrator:
         self.state_file = Path(__file__).parent.parent / 'data' / 'orchestrator_state.json'
         self.checkpoint_dir = Path(__file__).parent.parent / 'logs' / 'checkpoints'
         self.checkpoint_dir.mkdir(exist_ok=True, parents=True)
+
+        # Directorios de salida ya creados durante esta ejecución
+        self._known_dirs: set = set()
+
+        # Última lectura de get_registry_stats: (time.monotonic(), stats)
+        self._stats_cache: Optional[Tuple[float, Dict]] = None
         
         # Control de interrupciones
         signal.signal(signal.SIGINT, self.graceful_shutdown)
@@ -144,7 +156,8 @@ class AdvancedOrchestrator:
     
     def check_system_resources(self) -> bool:
         """Verificar si hay recursos disponibles para ejecutar más scrapers"""
-        cpu_percent = psutil.cpu_percent(interval=1)
+        # Sin bloquear: uso medio desde la comprobación anterior
+        cpu_percent = self._cpu_sampler.percent()
         memory_percent = psutil.virtual_memory().percent
         
         if cpu_percent > self.max_cpu_usage:
@@ -190,13 +203,19 @@ class AdvancedOrchestrator:
         """
         all_scraps = self.registry.load_urls_from_csv()
         
+        # next_run ya viene analizado por el registry en '_next_run_dt'
+        now = datetime.now()
         website_scraps = []
         for scrap in all_scraps:
-            if (scrap['website'] == website and 
-                (scrap['status'] == 'pending' or 
-                 (scrap['status'] == 'completed' and scrap['next_run'] and 
-                  datetime.now() >= datetime.fromisoformat(scrap['next_run'])))):
+            if scrap['website'] != website:
+                continue
+            status = scrap['status']
+            if status == 'pending':
                 website_scraps.append(scrap)
+            elif status == 'completed':
+                next_run_dt = scrap['_next_run_dt']
+                if next_run_dt is not None and now >= next_run_dt:
+                    website_scraps.append(scrap)
         
         # Ordenar según la fila en el CSV para preservar el orden definido
         website_scraps.sort(key=lambda x: x['csv_row'])
@@ -219,11 +238,9 @@ class AdvancedOrchestrator:
                 return None
 
             url = scrap['url']
+            # build_path ya crea el directorio de salida
             output_path = self.registry.get_output_path(scrap)
 
-            # Crear directorio de salida
-            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-
             # Actualizar registry a running
             self.registry.update_scrap_execution(
                 scrap['id'],
@@ -503,7 +520,9 @@ class AdvancedOrchestrator:
             / safe_city
             / operacion
         )
-        output_dir.mkdir(parents=True, exist_ok=True)
+        if output_dir not in self._known_dirs:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            self._known_dirs.add(output_dir)
         return str(output_dir / f"{safe_product}_{timestamp}.csv")
 
     def run_single_task(self, task: Dict):
@@ -607,6 +626,7 @@ class AdvancedOrchestrator:
                     'thread': thread,
                     'scrap': scrap,
                     'started_at': datetime.now(),
+                    'started_mono': time.monotonic(),
                     'result': None
                 }
 
@@ -632,6 +652,8 @@ class AdvancedOrchestrator:
         self.running = True
         
         # Iniciar monitor de rendimiento si está disponible
+        if monitoring_available and self.performance_monitor is None:
+            self.performance_monitor = DellT710PerformanceMonitor(log_interval=30)
         if self.performance_monitor:
             self.performance_monitor.start_monitoring()
         
@@ -682,34 +704,60 @@ class AdvancedOrchestrator:
         finally:
             self.graceful_shutdown()
     
-    def display_progress(self):
-        """Mostrar progreso visual en terminal"""
+    def _registry_stats(self) -> Dict:
+        """Estadísticas del registro, reutilizadas durante REGISTRY_STATS_TTL segundos"""
+        now = time.monotonic()
+        if self._stats_cache and now - self._stats_cache[0] < self.REGISTRY_STATS_TTL:
+            return self._stats_cache[1]
         stats = self.registry.get_registry_stats()
+        self._stats_cache = (now, stats)
+        return stats
+
+    def display_progress(self):
+        """Mostrar progreso visual en terminal
+
+        El bloque se arma completo y se escribe con una sola llamada.
+        """
+        stats = self._registry_stats()
         
-        print(f"\n{'='*80}")
-        print(f"🎛️ ORCHESTRATOR STATUS - {datetime.now().strftime('%H:%M:%S')}")
-        print(f"{'='*80}")
-        print(f"🔄 Active Websites: {len(self.active_scrapers)}/{self.max_concurrent_websites}")
+        lines = [
+            "",
+            "=" * 80,
+            f"🎛️ ORCHESTRATOR STATUS - {datetime.now().strftime('%H:%M:%S')}",
+            "=" * 80,
+            f"🔄 Active Websites: {len(self.active_scrapers)}/{self.max_concurrent_websites}",
+        ]
         
+        now = time.monotonic()
         for website, info in self.active_scrapers.items():
-            elapsed = datetime.now() - info['started_at']
+            hours, rest = divmod(int(now - info['started_mono']), 3600)
+            minutes, seconds = divmod(rest, 60)
             scrap = info['scrap']
-            print(f"   🌐 {website:15} | {scrap['operacion']:5} | {scrap['producto']:20} | ⏱️ {str(elapsed).split('.')[0]}")
-        
-        print(f"\n📊 Registry Stats:")
-        print(f"   ✅ Completed: {stats['completed']:3d}")
-        print(f"   ❌ Failed:    {stats['failed']:3d}")
-        print(f"   ⏳ Pending:   {stats['pending']:3d}")
-        print(f"   🔄 Running:   {stats['running']:3d}")
-        print(f"   🏠 Properties: {stats['total_properties_scraped']:,}")
+            lines.append(f"   🌐 {website:15} | {scrap['operacion']:5} | {scrap['producto']:20} | ⏱️ {hours:d}:{minutes:02d}:{seconds:02d}")
+        
+        lines += [
+            "",
+            "📊 Registry Stats:",
+            f"   ✅ Completed: {stats['completed']:3d}",
+            f"   ❌ Failed:    {stats['failed']:3d}",
+            f"   ⏳ Pending:   {stats['pending']:3d}",
+            f"   🔄 Running:   {stats['running']:3d}",
+            f"   🏠 Properties: {stats['total_properties_scraped']:,}",
+        ]
         
         # Recursos del sistema
         cpu_percent = psutil.cpu_percent()
         memory_percent = psutil.virtual_memory().percent
-        print(f"\n🖥️ System Resources:")
-        print(f"   CPU: {cpu_percent:5.1f}% | Memory: {memory_percent:5.1f}%")
-        
-        print(f"{'='*80}")
+        lines += [
+            "",
+            "🖥️ System Resources:",
+            f"   CPU: {cpu_percent:5.1f}% | Memory: {memory_percent:5.1f}%",
+            "=" * 80,
+            "",
+        ]
+        
+        sys.stdout.write("\n".join(lines))
+        sys.stdout.flush()
     
     def save_state(self):
         """Guardar estado actual del orquestador"""
@@ -755,6 +803,9 @@ class AdvancedOrchestrator:
         if self.performance_monitor:
             self.performance_monitor.stop_monitoring()
         
+        # Volcar a los CSV las actualizaciones pendientes del registry
+        self.registry.close()
+
         # Guardar estado final
         self.save_state()
         
@@ -772,8 +823,9 @@ class AdvancedOrchestrator:
             self.logger.info(f"📋 {len(paused_scraps)} scraps pausados encontrados")
             
             # Cambiar estado a pending para que sean procesados
-            for scrap in paused_scraps:
-                self.registry.update_scrap_execution(scrap['id'], 'pending')
+            with self.registry.batch():
+                for scrap in paused_scraps:
+                    self.registry.update_scrap_execution(scrap['id'], 'pending')
         
         # Iniciar orquestación normal
         self.run_orchestration()
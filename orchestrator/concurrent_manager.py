@@ -40,6 +40,7 @@ SCRAPER_CLASSES = {
 }
 
 from gdrive_backup_manager import GoogleDriveBackupManager
+from cpu_sampler import CpuSampler
 
 class DellT710ResourceMonitor:
     """Monitor de recursos específico para Dell T710"""
@@ -55,11 +56,15 @@ class DellT710ResourceMonitor:
         self.available_cores = int(self.total_cores * (self.max_cpu_usage / 100))  # 6.4 cores
         self.available_memory_gb = int(self.total_memory_gb * (self.max_memory_usage / 100))  # 19.2 GB
         
+        # Muestreo de CPU propio, independiente de otras lecturas del proceso
+        self._cpu_sampler = CpuSampler()
+        
         self.logger = logging.getLogger(__name__)
     
     def get_current_usage(self) -> Dict:
         """Obtener uso actual de recursos"""
-        cpu_percent = psutil.cpu_percent(interval=1)
+        # Sin bloquear: uso medio desde la lectura anterior
+        cpu_percent = self._cpu_sampler.percent()
         memory = psutil.virtual_memory()
         
         return {
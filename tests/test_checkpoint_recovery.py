@@ -0,0 +1,49 @@
+import logging
+import sys
+from pathlib import Path
+
+# Asegurar que el proyecto esté en el PYTHONPATH
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+sys.path.append(str(Path(__file__).resolve().parents[1] / "utils"))
+
+from utils.checkpoint_recovery import CheckpointRecoverySystem
+from utils.enhanced_scraps_registry import EnhancedScrapsRegistry
+
+
+def test_match_scraper_follows_name_order():
+    match = CheckpointRecoverySystem._match_scraper
+    assert match(["python3", "scrapers/mitula_scraper.py"]) == "mitula_scraper"
+    assert match(["python3", "-m", "http.server"]) is None
+    # Con varios nombres gana el primero de SCRAPER_NAMES, no el primero en aparecer
+    args = ["python3", "advanced_orchestrator.py", "--run", "lamudi_professional"]
+    assert match(args) == "lamudi_professional"
+
+
+def test_reset_scrap_statuses_goes_through_registry(tmp_path):
+    header = "PaginaWeb,Ciudad,Operacion,ProductoPaginaWeb,URL\n"
+    rows = "".join(f"TestSite,City,Ven,Dep{i},http://{i}.com\n" for i in range(3))
+    (tmp_path / "test_urls.csv").write_text(header + rows)
+
+    def make_registry():
+        registry = EnhancedScrapsRegistry()
+        registry.csv_urls_dir = tmp_path
+        registry.updates_file = tmp_path / "scraps_updates.jsonl"
+        return registry
+
+    registry = make_registry()
+    ids = [scrap["id"] for scrap in registry.urls_registry]
+    with registry.batch():
+        registry.update_scrap_execution(ids[0], "running")
+        registry.update_scrap_execution(ids[1], "running")
+        registry.update_scrap_execution(ids[2], "completed")
+
+    recovery = CheckpointRecoverySystem.__new__(CheckpointRecoverySystem)
+    recovery.registry = registry
+    recovery.logger = logging.getLogger(__name__)
+
+    in_progress = [scrap["id"] for scrap in recovery._in_progress_scraps()]
+    assert in_progress == ids[:2]
+    assert recovery.reset_scrap_statuses(in_progress + ["desconocido"]) == set(ids[:2])
+
+    statuses = [scrap["status"] for scrap in make_registry().urls_registry]
+    assert statuses == ["pending", "pending", "completed"]
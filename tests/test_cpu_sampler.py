@@ -0,0 +1,26 @@
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+# Asegurar que el proyecto esté en el PYTHONPATH
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from utils import cpu_sampler
+
+CpuTimes = namedtuple("CpuTimes", "user system idle iowait")
+
+
+def test_samplers_keep_independent_windows(monkeypatch):
+    readings = iter([
+        CpuTimes(0, 0, 100, 0),    # a: inicio
+        CpuTimes(0, 0, 100, 0),    # b: inicio
+        CpuTimes(30, 10, 140, 20),  # b: 40 ocupados de 100
+        CpuTimes(90, 10, 140, 20),  # a: 100 ocupados de 160
+    ])
+    monkeypatch.setattr(cpu_sampler.psutil, "cpu_times", lambda: next(readings))
+
+    a = cpu_sampler.CpuSampler()
+    b = cpu_sampler.CpuSampler()
+    assert b.percent() == 40.0
+    # La lectura de b no acorta la ventana de a
+    assert a.percent() == 62.5
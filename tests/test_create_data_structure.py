@@ -0,0 +1,29 @@
+import sys
+from pathlib import Path
+
+# Asegurar que el proyecto esté en el PYTHONPATH
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from utils import create_data_structure as cds
+
+
+def test_readmes_rewritten_only_when_changed(tmp_path):
+    combos = [("Site", "Gdl", "Ven", "Dep"), ("Site", "Zap", "Ren", "Cas")]
+    assert cds._create_directories(tmp_path, combos, ["Sep25"], ["01", "02"]) == 4
+    tasks = tuple((tmp_path, *combo, "Sep25", run) for combo in combos for run in ("01", "02"))
+
+    assert cds._make_batch(tasks, "2025-09-01 10:00:00") == 4
+    readme = tmp_path / "Site" / "Gdl" / "Ven" / "Dep" / "Sep25" / "01" / "README.md"
+    text = readme.read_text(encoding="utf-8")
+    assert text.startswith("# Site - Gdl - Ven - Dep\n## Sep25 - Run 01\n")
+    assert "`Site_Gdl_Ven_Dep_Sep25_01.csv`" in text
+
+    # Solo cambia la marca de tiempo: nada se reescribe
+    assert cds._make_batch(tasks, "2025-09-02 11:30:00") == 0
+    assert readme.read_text(encoding="utf-8") == text
+
+    # Un README modificado (mismo tamaño) o borrado se vuelve a escribir
+    readme.write_text(text.replace("Gdl", "GDL"), encoding="utf-8")
+    (tmp_path / "Site" / "Zap" / "Ren" / "Cas" / "Sep25" / "02" / "README.md").unlink()
+    assert cds._make_batch(tasks, "2025-09-03 12:00:00") == 2
+    assert "Ciudad**: Gdl" in readme.read_text(encoding="utf-8")
@@ -0,0 +1,75 @@
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Asegurar que el proyecto esté en el PYTHONPATH
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from utils.gdrive_backup_manager import GoogleDriveBackupManager
+
+
+def _make_manager(history_file):
+    # Sin __init__: no se configura logging ni se consulta rclone
+    manager = GoogleDriveBackupManager.__new__(GoogleDriveBackupManager)
+    manager.logger = logging.getLogger("test_gdrive_backup_manager")
+    manager.history_file = history_file
+    manager.backup_history = manager.load_backup_history()
+    return manager
+
+
+def test_legacy_history_is_migrated_to_jsonl(tmp_path):
+    history_file = tmp_path / "backup_history.jsonl"
+    legacy = [{"id": i} for i in range(GoogleDriveBackupManager.HISTORY_SIZE + 5)]
+    history_file.with_suffix(".json").write_text(json.dumps(legacy), encoding="utf-8")
+
+    manager = _make_manager(history_file)
+    assert [entry["id"] for entry in manager.backup_history] == list(range(5, 105))
+
+    manager.save_backup_history({"id": "new"})
+    manager.save_backup_history({"id": "newer"})
+
+    lines = history_file.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [*range(6, 105), "new", "newer"]
+    # Una nueva carga parte del diario y conserva el historial anterior
+    reloaded = _make_manager(history_file)
+    assert [entry["id"] for entry in reloaded.backup_history] == [*range(7, 105), "new", "newer"]
+
+
+def test_incremental_sync_window_starts_at_last_success(tmp_path, monkeypatch):
+    manager = _make_manager(tmp_path / "backup_history.jsonl")
+    manager.data_dir = tmp_path
+    manager.rclone_remote = "gdrive"
+    manager.rclone_base_path = "backup"
+    manager.backup_interval = 300
+    manager.last_sync_file = tmp_path / "last_sync.json"
+    manager._last_sync = manager._load_last_sync()
+
+    commands = []
+    returncodes = iter([0, 1, 0])
+
+    def fake_run(cmd, timeout, on_line=None):
+        commands.append(cmd)
+        return next(returncodes), ""
+
+    def max_age(cmd):
+        return int(cmd[cmd.index("--max-age") + 1].rstrip("s")) if "--max-age" in cmd else None
+
+    now = [1_000_000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    manager._run_rclone = fake_run
+
+    # Sin respaldo correcto previo se copia todo
+    manager._incremental_sync()
+    assert max_age(commands[-1]) is None
+
+    # Una pasada fallida no mueve el inicio de la ventana
+    now[0] += 300
+    assert manager._incremental_sync()["failed"] == 1
+    now[0] += 300
+    manager._incremental_sync()
+    assert max_age(commands[-1]) == 600 + manager.SYNC_MARGIN_SECONDS
+
+    # El último respaldo correcto sobrevive a un reinicio
+    assert manager._load_last_sync() == now[0]
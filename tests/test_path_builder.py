@@ -0,0 +1,28 @@
+import sys
+from pathlib import Path
+
+# Asegurar que el proyecto esté en el PYTHONPATH
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from utils import path_builder
+
+
+def test_run_number_follows_highest_existing_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(path_builder, "_project_root", lambda: tmp_path)
+    path_builder._base_dir.cache_clear()
+    try:
+        first = path_builder.build_path("Site", "Gdl", "Ven", "Dep")
+        assert first.run_number == "01"
+        assert first.directory == tmp_path / "data" / "Site" / "Gdl" / "Ven" / "Dep" / first.month_year / "01"
+        assert first.file_name == f"Site_Gdl_Ven_Dep_{first.month_year}_01.csv"
+
+        base_dir = first.directory.parent
+        (base_dir / "03").mkdir()
+        # Ni archivos ni nombres que no son de dos dígitos cuentan como corridas
+        (base_dir / "07").write_text("")
+        (base_dir / "100").mkdir()
+        (base_dir / "x9").mkdir()
+
+        assert path_builder.build_path("Site", "Gdl", "Ven", "Dep").run_number == "04"
+    finally:
+        path_builder._base_dir.cache_clear()
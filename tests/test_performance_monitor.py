@@ -0,0 +1,65 @@
+import sys
+from contextlib import nullcontext
+from pathlib import Path
+
+# Asegurar que el proyecto esté en el PYTHONPATH
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from monitoring import performance_monitor as pm
+
+
+class FakeProcess:
+    # pid -> (nombre, hora de inicio) del proceso que ocupa el PID
+    table = {}
+    probed = []
+
+    def __init__(self, pid):
+        self.pid = pid
+        self._name, self._create_time = self.table[pid]
+        self.probed.append(pid)
+
+    def oneshot(self):
+        return nullcontext()
+
+    def name(self):
+        return self._name
+
+    def create_time(self):
+        return self._create_time
+
+    def is_running(self):
+        return self.table.get(self.pid, (None, None))[1] == self._create_time
+
+
+def _make_monitor(monkeypatch):
+    monkeypatch.setattr(pm.psutil, "pids", lambda: list(FakeProcess.table))
+    monkeypatch.setattr(pm.psutil, "Process", FakeProcess)
+    monitor = pm.DellT710PerformanceMonitor.__new__(pm.DellT710PerformanceMonitor)
+    monitor._tracked_procs = {}
+    monitor._seen_pids = set()
+    return monitor
+
+
+def test_only_new_pids_are_probed(monkeypatch):
+    monitor = _make_monitor(monkeypatch)
+    FakeProcess.table = {10: ("bash", 1.0), 11: ("python3", 2.0)}
+    FakeProcess.probed = []
+    assert {pid: entry[0] for pid, entry in monitor._refresh_tracked_procs().items()} == {11: "python"}
+    assert sorted(FakeProcess.probed) == [10, 11]
+
+    FakeProcess.table[12] = ("chrome", 3.0)
+    FakeProcess.probed = []
+    tracked = monitor._refresh_tracked_procs()
+    assert {pid: entry[0] for pid, entry in tracked.items()} == {11: "python", 12: "chrome"}
+    assert FakeProcess.probed == [12]
+
+
+def test_reused_tracked_pid_is_reclassified(monkeypatch):
+    monitor = _make_monitor(monkeypatch)
+    FakeProcess.table = {11: ("python3", 2.0), 12: ("chrome", 3.0)}
+    monitor._refresh_tracked_procs()
+
+    # Otro scraper toma el PID 11 y un proceso ajeno el 12 entre dos muestras
+    FakeProcess.table = {11: ("python3", 6.0), 12: ("bash", 7.0)}
+    tracked = monitor._refresh_tracked_procs()
+    assert {pid: entry[:2] for pid, entry in tracked.items()} == {11: ("python", 6.0)}
@@ -0,0 +1,214 @@
+import csv
+import gc
+import sys
+import threading
+import weakref
+from pathlib import Path
+
+# Asegurar que el proyecto esté en el PYTHONPATH
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from utils.enhanced_scraps_registry import EnhancedScrapsRegistry
+
+
+def _create_csv(csv_path, rows=None):
+    header = ["PaginaWeb", "Ciudad", "Operacion", "ProductoPaginaWeb", "URL"]
+    rows = rows or [
+        ("TestSite", "City", "Ven", "Dep", "http://a.com"),
+        ("TestSite", "City", "Ven", "Dep", "http://b.com"),
+    ]
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def _make_registry(tmp_path):
+    registry = EnhancedScrapsRegistry()
+    registry.csv_urls_dir = tmp_path
+    registry.updates_file = tmp_path / "scraps_updates.jsonl"
+    return registry
+
+
+def test_updates_are_replayed_and_compacted(tmp_path):
+    csv_file = tmp_path / "test_urls.csv"
+    _create_csv(csv_file)
+
+    registry = _make_registry(tmp_path)
+    scrap_id = registry.urls_registry[0]["id"]
+    assert registry.update_scrap_execution(scrap_id, "completed", records_extracted=42)
+
+    # El CSV no se reescribe hasta compactar, pero una nueva carga ya ve el cambio
+    with open(csv_file, newline="", encoding="utf-8") as f:
+        assert all(row["Status"] == "" for row in csv.DictReader(f))
+
+    reloaded = _make_registry(tmp_path)
+    assert [s["status"] for s in reloaded.urls_registry] == ["completed", ""]
+    assert reloaded.urls_registry[0]["records"] == "42"
+
+    reloaded.close()
+    assert not reloaded.updates_file.exists()
+
+    with open(csv_file, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["Status"] for row in rows] == ["completed", ""]
+    assert rows[0]["Records"] == "42"
+    assert rows[0]["ScrapOfMonth"]
+
+
+def test_batch_writes_journal_on_exit(tmp_path):
+    _create_csv(tmp_path / "test_urls.csv")
+
+    registry = _make_registry(tmp_path)
+    scrap_id = registry.urls_registry[0]["id"]
+
+    with registry.batch():
+        assert registry.update_scrap_execution(scrap_id, "running")
+        assert registry.update_scrap_execution(scrap_id, "completed")
+        assert not registry.updates_file.exists()
+
+    assert len(registry.updates_file.read_bytes().splitlines()) == 2
+    assert _make_registry(tmp_path).urls_registry[0]["status"] == "completed"
+
+
+def test_registry_stats_count_statuses(tmp_path):
+    _create_csv(tmp_path / "test_urls.csv")
+
+    registry = _make_registry(tmp_path)
+    scrap_id = registry.urls_registry[0]["id"]
+    assert registry.update_scrap_execution(scrap_id, "completed", records_extracted=7)
+
+    stats = registry.get_registry_stats()
+    assert stats["total_scraps"] == 2
+    assert (stats["completed"], stats["pending"], stats["running"]) == (1, 1, 0)
+    assert stats["total_properties_scraped"] == 7
+
+
+def test_concurrent_updates_are_not_lost(tmp_path):
+    rows = [("TestSite", "City", "Ven", f"Dep{i}", f"http://{i}.com") for i in range(40)]
+    _create_csv(tmp_path / "test_urls.csv", rows)
+
+    registry = _make_registry(tmp_path)
+    # Compactar a menudo para que escrituras y compactaciones se crucen
+    registry.compact_threshold = 7
+    ids = [scrap["id"] for scrap in registry.urls_registry]
+    assert len(set(ids)) == 40
+
+    def worker(chunk):
+        for records, scrap_id in chunk:
+            assert registry.update_scrap_execution(scrap_id, "completed", records_extracted=records)
+
+    pairs = list(enumerate(ids))
+    threads = [threading.Thread(target=worker, args=(pairs[i::8],)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    reloaded = _make_registry(tmp_path)
+    assert [s["status"] for s in reloaded.urls_registry] == ["completed"] * 40
+    assert [s["records"] for s in reloaded.urls_registry] == [str(i) for i in range(40)]
+
+
+def test_compaction_keeps_updates_written_meanwhile(tmp_path, monkeypatch):
+    rows = [("TestSite", "City", "Ven", f"Dep{i}", f"http://{i}.com") for i in range(2)]
+    _create_csv(tmp_path / "test_urls.csv", rows)
+
+    registry = _make_registry(tmp_path)
+    # Otra instancia (p. ej. otro proceso) que escribe en el mismo diario
+    other = _make_registry(tmp_path)
+    first, second = (scrap["id"] for scrap in registry.urls_registry)
+    assert registry.update_scrap_execution(first, "completed")
+
+    write_csv = registry._write_csv
+
+    def write_while_other_updates(*args):
+        assert other.update_scrap_execution(second, "failed")
+        write_csv(*args)
+
+    monkeypatch.setattr(registry, "_write_csv", write_while_other_updates)
+    assert registry.compact_updates()
+
+    assert not registry.compacting_file.exists()
+    assert len(registry.updates_file.read_bytes().splitlines()) == 1
+    assert [s["status"] for s in _make_registry(tmp_path).urls_registry] == ["completed", "failed"]
+
+
+def test_interrupted_compaction_is_replayed(tmp_path):
+    _create_csv(tmp_path / "test_urls.csv")
+
+    registry = _make_registry(tmp_path)
+    assert registry.update_scrap_execution(registry.urls_registry[0]["id"], "completed")
+    # Simular una compactación que apartó el diario y no llegó a terminar
+    registry.updates_file.rename(registry.compacting_file)
+
+    reloaded = _make_registry(tmp_path)
+    assert reloaded.urls_registry[0]["status"] == "completed"
+
+    assert reloaded.compact_updates()
+    assert not reloaded.compacting_file.exists()
+    with open(tmp_path / "test_urls.csv", newline="", encoding="utf-8") as f:
+        assert [row["Status"] for row in csv.DictReader(f)] == ["completed", ""]
+
+
+def test_ids_only_replace_spaces_in_city_and_product(tmp_path):
+    rows = [("Test Site", "Ciudad Juárez", "Ven Renta", "Casa-Sola Ñ", "http://a.com")]
+    _create_csv(tmp_path / "test_urls.csv", rows)
+
+    registry = _make_registry(tmp_path)
+    assert registry.urls_registry[0]["id"] == "test site_ciudad_juárez_ven renta_casa_sola_n"
+
+
+def test_updates_follow_scrap_id_when_csv_rows_move(tmp_path):
+    csv_file = tmp_path / "test_urls.csv"
+    _create_csv(csv_file, [("S", "C", "Ven", "A", "http://a.com"), ("S", "C", "Ven", "B", "http://b.com")])
+
+    registry = _make_registry(tmp_path)
+    assert registry.update_scrap_execution("s_c_ven_b", "completed", records_extracted=9)
+    assert registry.update_scrap_execution("s_c_ven_a", "failed")
+
+    # El CSV se edita: B sube a la fila 1, Z ocupa la fila 2 y A desaparece
+    _create_csv(csv_file, [("S", "C", "Ven", "B", "http://b.com"), ("S", "C", "Ven", "Z", "http://z.com")])
+
+    reloaded = _make_registry(tmp_path)
+    by_id = {s["id"]: s for s in reloaded.urls_registry}
+    assert (by_id["s_c_ven_b"]["status"], by_id["s_c_ven_b"]["records"]) == ("completed", "9")
+    assert by_id["s_c_ven_z"]["status"] == ""
+
+    assert reloaded.compact_updates()
+    with open(csv_file, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [(row["ProductoPaginaWeb"], row["Status"], row["Records"]) for row in rows] == [
+        ("B", "completed", "9"),
+        ("Z", "", ""),
+    ]
+
+
+def test_batch_does_not_block_other_threads(tmp_path):
+    rows = [("TestSite", "City", "Ven", f"Dep{i}", f"http://{i}.com") for i in range(2)]
+    _create_csv(tmp_path / "test_urls.csv", rows)
+
+    registry = _make_registry(tmp_path)
+    first, second = (scrap["id"] for scrap in registry.urls_registry)
+
+    with registry.batch():
+        assert registry.update_scrap_execution(first, "running")
+        other = threading.Thread(target=registry.update_scrap_execution, args=(second, "completed"))
+        other.start()
+        other.join(timeout=5)
+        assert not other.is_alive()
+        # La actualización del otro hilo ya está en el diario
+        assert _make_registry(tmp_path).urls_registry[1]["status"] == "completed"
+
+    assert [s["status"] for s in _make_registry(tmp_path).urls_registry] == ["running", "completed"]
+
+
+def test_registries_are_not_kept_alive(tmp_path):
+    _create_csv(tmp_path / "test_urls.csv")
+
+    registry = _make_registry(tmp_path)
+    assert registry.urls_registry
+    ref = weakref.ref(registry)
+    del registry
+    gc.collect()
+    assert ref() is None
@@ -0,0 +1,78 @@
+import csv
+import os
+import sys
+from pathlib import Path
+
+# Asegurar que el proyecto esté en el PYTHONPATH
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from utils import url_utils
+
+
+def _write_csv(csv_path, rows):
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["PaginaWeb", "Ciudad", "Operacion", "ProductoPaginaWeb", "URL"])
+        writer.writerows(rows)
+
+
+def test_load_urls_cache_hands_out_copies(tmp_path):
+    csv_path = tmp_path / "urls.csv"
+    _write_csv(csv_path, [("Site", "Gdl", "Ven", "Dep", "http://a.com"), ("Site", "Gdl", "Ven", "Dep", "")])
+
+    first = url_utils.load_urls_from_csv(str(csv_path))
+    assert [row["URL"] for row in first] == ["http://a.com"]
+    first[0]["URL"] = "modificada"
+    first.clear()
+
+    # La segunda lectura sale de la caché y no ve los cambios del llamador
+    assert [row["URL"] for row in url_utils.load_urls_from_csv(str(csv_path))] == ["http://a.com"]
+
+
+def test_load_urls_cache_invalidated_on_change(tmp_path):
+    csv_path = tmp_path / "urls.csv"
+    _write_csv(csv_path, [("Site", "Gdl", "Ven", "Dep", "http://a.com")])
+    assert len(url_utils.load_urls_from_csv(str(csv_path))) == 1
+
+    # Cambio de tamaño
+    _write_csv(csv_path, [("Site", "Gdl", "Ven", "Dep", "http://a.com"), ("Site", "Gdl", "Ven", "Dep", "http://b.com")])
+    assert len(url_utils.load_urls_from_csv(str(csv_path))) == 2
+
+    # Mismo tamaño, distinta fecha de modificación
+    st = csv_path.stat()
+    _write_csv(csv_path, [("Site", "Gdl", "Ven", "Dep", "http://c.com"), ("Site", "Gdl", "Ven", "Dep", "http://d.com")])
+    os.utime(csv_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert csv_path.stat().st_size == st.st_size
+    urls = [row["URL"] for row in url_utils.load_urls_from_csv(str(csv_path))]
+    assert urls == ["http://c.com", "http://d.com"]
+
+
+def test_site_filter_matches_csv_fallback(tmp_path, monkeypatch):
+    with open(tmp_path / "a.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["PaginaWeb", "Ciudad", "Operacion", "Url", "Extra", "URL"])
+        writer.writerows([
+            (" site ", "Gdl", "Ven", "http://url-low.com", "x", " http://a.com "),
+            ("Site", "Gdl", "Ven", "http://url-low.com", "x", ""),
+            ("Otro", "Gdl", "Ven", "", "x", "http://otro.com"),
+            ("SITE", "Gdl", "Ven", "", "", ""),
+        ])
+    _write_csv(tmp_path / "b.csv", [("Site", "Zap", "Ren", "Cas", "http://b.com")])
+    # Sin columna PaginaWeb: se ignora en ambos caminos
+    (tmp_path / "c.csv").write_text("Sitio,URL\nSite,http://c.com\n", encoding="utf-8")
+
+    # El camino con pandas se usa de verdad (no cae al módulo csv)
+    assert url_utils._site_urls_with_pandas(tmp_path / "b.csv", "site") == ["http://b.com"]
+    assert url_utils._site_urls_with_pandas(tmp_path / "c.csv", "site") is None
+
+    with_pandas = url_utils.load_urls_for_site(str(tmp_path), "Site")
+    monkeypatch.setattr(url_utils, "_site_urls_with_pandas", lambda path, site: None)
+    without_pandas = url_utils.load_urls_for_site(str(tmp_path), "Site")
+
+    assert with_pandas == without_pandas
+    # La lectura concurrente conserva el orden de los archivos del directorio
+    sequential = [
+        url for path in tmp_path.glob("*.csv") for url in url_utils._site_urls_in_file(path, "site")
+    ]
+    assert without_pandas == sequential
+    assert sorted(with_pandas) == ["http://a.com", "http://b.com", "http://url-low.com"]
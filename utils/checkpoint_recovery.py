@@ -10,15 +10,29 @@ import json
 import time
 import pickle
 import logging
-import csv
+import re
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 import argparse
 
 # Agregar paths del proyecto
 sys.path.append(str(Path(__file__).parent.parent))
-from utils.enhanced_scraps_registry import EnhancedScrapsRegistry
+from utils.enhanced_scraps_registry import get_registry
+
+# orjson es opcional; serializa los checkpoints y reportes mucho más rápido
+try:
+    import orjson
+    orjson_available = True
+except ImportError:
+    orjson_available = False
+
+
+def _json_dumps_pretty(obj) -> bytes:
+    """Serializar ``obj`` a JSON indentado en bytes UTF-8"""
+    if orjson_available:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
 
 class CheckpointRecoverySystem:
     """
@@ -29,11 +43,21 @@ class CheckpointRecoverySystem:
     - Continuación desde el último punto guardado
     """
     
+    # Scripts que se reconocen como scrapers (o el orquestador) en la línea de comandos
+    SCRAPER_NAMES = (
+        'inmuebles24_professional', 'casas_y_terrenos_scraper',
+        'lamudi_professional', 'mitula_scraper',
+        'propiedades_professional', 'segundamano_professional',
+        'trovit_professional', 'advanced_orchestrator'
+    )
+    # Un solo patrón para buscar todos los nombres de una pasada
+    _SCRAPER_RE = re.compile('|'.join(map(re.escape, SCRAPER_NAMES)))
+
     def __init__(self):
         self.setup_logging()
         
         # Componentes
-        self.registry = EnhancedScrapsRegistry()
+        self.registry = get_registry()
         
         # Directorios de checkpoint
         self.project_root = Path(__file__).parent.parent
@@ -54,8 +78,8 @@ class CheckpointRecoverySystem:
         self.max_recovery_attempts = 3
         
         self.logger.info("🔄 Checkpoint Recovery System inicializado")
-        self.logger.info(f"   Checkpoint dir: {self.checkpoint_dir}")
-        self.logger.info(f"   Recovery dir: {self.recovery_dir}")
+        self.logger.info("   Checkpoint dir: %s", self.checkpoint_dir)
+        self.logger.info("   Recovery dir: %s", self.recovery_dir)
     
     def setup_logging(self):
         """Configurar logging del sistema de recuperación"""
@@ -76,46 +100,39 @@ class CheckpointRecoverySystem:
         self.logger = logging.getLogger(__name__)
 
     def load_registry_data(self) -> List[Dict]:
-        """Cargar datos completos del registry"""
+        """Cargar datos completos del registry (CSV de URLs + diario de actualizaciones)"""
         try:
-            if not self.registry.registry_file.exists():
-                return []
-            with open(self.registry.registry_file, 'r', encoding='utf-8') as f:
-                return list(csv.DictReader(f))
+            return list(self.registry.urls_registry)
         except Exception as e:
             self.logger.error(f"❌ Error cargando registry: {e}")
             return []
 
-    def reset_scrap_status(self, scrap_id: str) -> bool:
-        """Restablecer estado de un scrap a 'Pendiente'"""
-        try:
-            if not self.registry.registry_file.exists():
-                return False
+    def _in_progress_scraps(self) -> List[Dict]:
+        """Scraps que quedaron en ejecución al interrumpirse el sistema"""
+        return [s for s in self.load_registry_data() if s.get('status') == 'running']
 
-            rows = []
-            updated = False
-            with open(self.registry.registry_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                fieldnames = reader.fieldnames
-                for row in reader:
-                    if row['id'] == scrap_id:
-                        row['ultimo_estado'] = 'Pendiente'
-                        row['ultima_ejecucion'] = ''
-                        row['proxima_ejecucion'] = ''
-                        updated = True
-                    rows.append(row)
+    def reset_scrap_status(self, scrap_id: str) -> bool:
+        """Restablecer estado de un scrap a 'pending'"""
+        return scrap_id in self.reset_scrap_statuses([scrap_id])
 
-            if updated:
-                with open(self.registry.registry_file, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                    writer.writerows(rows)
+    def reset_scrap_statuses(self, scrap_ids: Iterable[str]) -> Set[str]:
+        """Restablecer varios scraps a 'pending' con una sola escritura del diario
 
-            return updated
+        Devuelve los ids que se encontraron y restablecieron.
+        """
+        pending_ids = list(dict.fromkeys(scrap_ids))
+        reset_ids: Set[str] = set()
+        try:
+            # El registry escribe el diario de forma atómica al salir del batch
+            with self.registry.batch():
+                for scrap_id in pending_ids:
+                    if self.registry.update_scrap_execution(scrap_id, 'pending'):
+                        reset_ids.add(scrap_id)
+            return reset_ids
 
         except Exception as e:
-            self.logger.error(f"❌ Error restableciendo scrap {scrap_id}: {e}")
-            return False
+            self.logger.error(f"❌ Error restableciendo scraps {sorted(pending_ids)}: {e}")
+            return set()
     
     def create_system_checkpoint(self, orchestrator_state: Dict = None, active_scrapers: List[Dict] = None) -> bool:
         """Crear checkpoint completo del sistema"""
@@ -129,14 +146,15 @@ class CheckpointRecoverySystem:
                 'checkpoint_version': '1.0'
             }
             
-            # Guardar checkpoint principal
-            with open(self.system_state_file, 'w', encoding='utf-8') as f:
-                json.dump(checkpoint_data, f, indent=2, ensure_ascii=False)
+            # Serializar una vez para el checkpoint principal y su copia
+            data = _json_dumps_pretty(checkpoint_data)
+            with open(self.system_state_file, 'wb') as f:
+                f.write(data)
             
             # Crear copia de seguridad con timestamp
             backup_file = self.checkpoint_dir / f'system_checkpoint_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
-            with open(backup_file, 'w', encoding='utf-8') as f:
-                json.dump(checkpoint_data, f, indent=2, ensure_ascii=False)
+            with open(backup_file, 'wb') as f:
+                f.write(data)
             
             self.logger.info("💾 Checkpoint del sistema creado")
             return True
@@ -154,32 +172,28 @@ class CheckpointRecoverySystem:
             cpu_percent = psutil.cpu_percent()
             memory = psutil.virtual_memory()
             
-            # Procesos Python activos (scrapers)
+            # Procesos Python activos (scrapers): primero se busca el script
+            # en la línea de comandos de cada proceso y solo de los
+            # reconocidos se consultan nombre y hora de inicio
             python_processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'create_time']):
+            for pid, args in self._iter_cmdlines():
+                script = self._match_scraper(args)
+                if script is None:
+                    continue
                 try:
-                    if proc.info['name'] and 'python' in proc.info['name'].lower():
-                        cmdline = ' '.join(proc.info['cmdline']) if proc.info['cmdline'] else ''
-                        
-                        # Buscar scrapers conocidos
-                        scraper_names = [
-                            'inmuebles24_professional', 'casas_y_terrenos_scraper',
-                            'lamudi_professional', 'mitula_scraper',
-                            'propiedades_professional', 'segundamano_professional',
-                            'trovit_professional', 'advanced_orchestrator'
-                        ]
-                        
-                        for scraper_name in scraper_names:
-                            if scraper_name in cmdline:
-                                python_processes.append({
-                                    'pid': proc.info['pid'],
-                                    'script': scraper_name,
-                                    'cmdline': cmdline,
-                                    'start_time': datetime.fromtimestamp(proc.info['create_time']).isoformat()
-                                })
-                                break
-                except:
+                    proc = psutil.Process(pid)
+                    with proc.oneshot():
+                        if 'python' not in proc.name().lower():
+                            continue
+                        start_time = proc.create_time()
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
                     continue
+                python_processes.append({
+                    'pid': pid,
+                    'script': script,
+                    'cmdline': ' '.join(args),
+                    'start_time': datetime.fromtimestamp(start_time).isoformat()
+                })
             
             return {
                 'cpu_percent': cpu_percent,
@@ -194,6 +208,44 @@ class CheckpointRecoverySystem:
             self.logger.warning(f"⚠️ Error obteniendo estado del sistema: {e}")
             return {'error': str(e)}
     
+    @classmethod
+    def _match_scraper(cls, args: List[str]) -> Optional[str]:
+        """Nombre del scraper presente en ``args`` (``None`` si no hay ninguno)
+
+        Si aparecen varios gana el primero de ``SCRAPER_NAMES``.
+        """
+        # Argumentos unidos por NUL para que ninguna coincidencia abarque dos
+        found = set(cls._SCRAPER_RE.findall('\x00'.join(args)))
+        if not found:
+            return None
+        return next(name for name in cls.SCRAPER_NAMES if name in found)
+
+    @staticmethod
+    def _iter_cmdlines():
+        """Recorrer ``(pid, argumentos)`` de todos los procesos
+
+        En Linux se lee directamente ``/proc/<pid>/cmdline``, sin crear un
+        ``psutil.Process`` (ni su comprobación de reutilización de PID) por
+        cada proceso del sistema. En otros sistemas se usa ``process_iter``.
+        """
+        if not os.path.isdir('/proc/self'):
+            import psutil
+            for proc in psutil.process_iter(['cmdline']):
+                yield proc.pid, proc.info['cmdline'] or []
+            return
+
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry}/cmdline', 'rb') as f:
+                    raw = f.read()
+            except OSError:
+                continue
+            if raw:
+                args = raw.decode('utf-8', 'replace').rstrip('\x00').split('\x00')
+                yield int(entry), args
+
     def save_orchestrator_checkpoint(self, orchestrator_state: Dict) -> bool:
         """Guardar checkpoint específico del orquestador"""
         try:
@@ -205,8 +257,8 @@ class CheckpointRecoverySystem:
                 'failed_count': orchestrator_state.get('failed_count', 0)
             }
             
-            with open(self.orchestrator_checkpoint, 'w', encoding='utf-8') as f:
-                json.dump(checkpoint, f, indent=2, ensure_ascii=False)
+            with open(self.orchestrator_checkpoint, 'wb') as f:
+                f.write(_json_dumps_pretty(checkpoint))
             
             self.logger.debug("💾 Orchestrator checkpoint guardado")
             return True
@@ -236,10 +288,10 @@ class CheckpointRecoverySystem:
             
             # También guardar versión JSON legible
             json_file = self.checkpoint_dir / f'scraper_{scraper_id}_checkpoint.json'
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump({k: v for k, v in checkpoint_data.items() if k != 'session_data'}, f, indent=2, ensure_ascii=False)
+            with open(json_file, 'wb') as f:
+                f.write(_json_dumps_pretty({k: v for k, v in checkpoint_data.items() if k != 'session_data'}))
             
-            self.logger.debug(f"💾 Scraper checkpoint guardado: {scraper_id}")
+            self.logger.debug("💾 Scraper checkpoint guardado: %s", scraper_id)
             return True
             
         except Exception as e:
@@ -288,8 +340,7 @@ class CheckpointRecoverySystem:
                 reasons.append(f"Missing processes: {len(missing_processes)}")
             
             # Verificar scraps en progreso en registry
-            scraps = self.load_registry_data()
-            in_progress = [s for s in scraps if s.get('ultimo_estado', '').lower() == 'en_progreso']
+            in_progress = self._in_progress_scraps()
 
             if in_progress:
                 interrupted = True
@@ -321,9 +372,9 @@ class CheckpointRecoverySystem:
             orchestrator_state = checkpoint['orchestrator_state']
             checkpoint_time = datetime.fromisoformat(checkpoint['timestamp'])
             
-            self.logger.info(f"🔄 Recuperando estado del orquestador desde: {checkpoint_time}")
-            self.logger.info(f"   Active websites: {orchestrator_state.get('active_websites', [])}")
-            self.logger.info(f"   Completed: {orchestrator_state.get('completed_count', 0)}")
+            self.logger.info("🔄 Recuperando estado del orquestador desde: %s", checkpoint_time)
+            self.logger.info("   Active websites: %s", orchestrator_state.get('active_websites', []))
+            self.logger.info("   Completed: %s", orchestrator_state.get('completed_count', 0))
             
             return orchestrator_state
             
@@ -337,7 +388,7 @@ class CheckpointRecoverySystem:
             checkpoint_file = self.checkpoint_dir / f'scraper_{scraper_id}_checkpoint.pkl'
             
             if not checkpoint_file.exists():
-                self.logger.info(f"📋 No hay checkpoint para scraper: {scraper_id}")
+                self.logger.info("📋 No hay checkpoint para scraper: %s", scraper_id)
                 return None
             
             with open(checkpoint_file, 'rb') as f:
@@ -346,9 +397,9 @@ class CheckpointRecoverySystem:
             progress = checkpoint_data['progress']
             checkpoint_time = datetime.fromisoformat(checkpoint_data['timestamp'])
             
-            self.logger.info(f"🔄 Recuperando scraper {scraper_id} desde: {checkpoint_time}")
-            self.logger.info(f"   Current page: {progress.get('current_page', 0)}")
-            self.logger.info(f"   Properties scraped: {progress.get('properties_scraped', 0)}")
+            self.logger.info("🔄 Recuperando scraper %s desde: %s", scraper_id, checkpoint_time)
+            self.logger.info("   Current page: %s", progress.get('current_page', 0))
+            self.logger.info("   Properties scraped: %s", progress.get('properties_scraped', 0))
             
             return checkpoint_data
             
@@ -381,7 +432,7 @@ class CheckpointRecoverySystem:
                     continue
             
             if cleaned_count > 0:
-                self.logger.info(f"🧹 Limpiados {cleaned_count} checkpoints antiguos")
+                self.logger.info("🧹 Limpiados %d checkpoints antiguos", cleaned_count)
             
         except Exception as e:
             self.logger.warning(f"⚠️ Error limpiando checkpoints: {e}")
@@ -400,10 +451,10 @@ class CheckpointRecoverySystem:
                 'system_state': self.get_system_state()
             }
             
-            with open(report_file, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, ensure_ascii=False)
+            with open(report_file, 'wb') as f:
+                f.write(_json_dumps_pretty(report))
             
-            self.logger.info(f"📄 Reporte de recuperación creado: {report_file}")
+            self.logger.info("📄 Reporte de recuperación creado: %s", report_file)
             return str(report_file)
             
         except Exception as e:
@@ -474,22 +525,18 @@ class CheckpointRecoverySystem:
             report_file = self.create_recovery_report(interruption_data)
             
             # 3. Recuperar scraps en progreso
-            scraps = self.load_registry_data()
-            in_progress = [s for s in scraps if s.get('ultimo_estado', '').lower() == 'en_progreso']
+            in_progress = self._in_progress_scraps()
 
-            recovery_count = 0
+            # Una sola escritura del diario para todos los scraps
+            reset_ids = self.reset_scrap_statuses(scrap['id'] for scrap in in_progress)
             for scrap in in_progress:
-                try:
-                    if self.reset_scrap_status(scrap['id']):
-                        recovery_count += 1
-                        self.logger.info(
-                            f"🔄 Scraper recuperado: {scrap['website']} ({scrap['operacion']})"
-                        )
-                except Exception as e:
-                    self.logger.error(f"❌ Error recuperando scrap {scrap.get('id')}: {e}")
+                if scrap['id'] in reset_ids:
+                    self.logger.info(
+                        "🔄 Scraper recuperado: %s (%s)", scrap['website'], scrap['operacion']
+                    )
 
-            if recovery_count > 0:
-                self.logger.info(f"✅ {recovery_count} scrapers marcados para recuperación")
+            if reset_ids:
+                self.logger.info("✅ %d scrapers marcados para recuperación", len(reset_ids))
             
             # 4. Limpiar checkpoints antiguos
             self.cleanup_old_checkpoints()
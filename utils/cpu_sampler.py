@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+CPU Sampler - PropertyScraper Dell710
+Uso de CPU sin bloquear, medido desde la lectura anterior de cada consumidor
+"""
+
+import threading
+
+import psutil
+
+
+def _cpu_totals(times) -> tuple:
+    """Tiempo total y ocupado de ``psutil.cpu_times()`` (como psutil)"""
+    # En Linux guest/guest_nice ya están incluidos en user/nice
+    total = sum(times) - getattr(times, 'guest', 0) - getattr(times, 'guest_nice', 0)
+    idle = times.idle + getattr(times, 'iowait', 0)
+    return total, total - idle
+
+
+class CpuSampler:
+    """
+    Porcentaje de CPU desde la llamada anterior a ``percent()``
+
+    ``psutil.cpu_percent(interval=None)`` mide desde la última llamada de
+    cualquier parte del proceso, así que cada consulta de otro componente
+    acorta la ventana de los demás. Cada sampler guarda su propia lectura de
+    ``psutil.cpu_times()`` y no se ve afectado por los otros.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last = _cpu_totals(psutil.cpu_times())
+
+    def percent(self) -> float:
+        """Uso medio de CPU (0-100) desde la lectura anterior"""
+        current = _cpu_totals(psutil.cpu_times())
+        with self._lock:
+            last, self._last = self._last, current
+        total_delta = current[0] - last[0]
+        if total_delta <= 0:
+            return 0.0
+        busy = (current[1] - last[1]) / total_delta * 100
+        return round(min(max(busy, 0.0), 100.0), 1)
@@ -10,54 +10,230 @@ combination, directories are created following the pattern::
 where ``MesAño`` uses three letter month abbreviations and the last two digits
 of the year (e.g. ``Sep25``) and ``Run`` is ``01`` or ``02``.  A ``README.md``
 template describing the expected file naming convention is placed inside every
-``Run`` directory.
+``Run`` directory, or collected into ``data/READMEs.tar`` with
+``--readme-archive``.
 """
 
 from __future__ import annotations
 
+import argparse
 import csv
 import datetime as dt
 import calendar
+import functools
+import io
+import itertools
+import multiprocessing
+import os
+import tarfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Sequence
+
+
+def _iter_url_csvs(urls_dir: str | os.PathLike[str]):
+    """Yield the paths of the ``*_urls.csv`` files inside ``urls_dir``."""
+
+    with os.scandir(urls_dir) as it:
+        for entry in it:
+            if entry.name.endswith("_urls.csv") and entry.is_file():
+                yield entry.path
+
+
+def _parse_one_csv(csv_path: str) -> set[tuple[str, str, str, str]]:
+    """Return the (PaginaWeb, Ciudad, Operacion, Producto) tuples of one CSV."""
+
+    combos: set[tuple[str, str, str, str]] = set()
+    with open(csv_path, newline="", encoding="utf-8") as fh:
+        reader = csv.DictReader(fh)
+        for row in reader:
+            site = (row.get("PaginaWeb") or "").strip()
+            city = (row.get("Ciudad") or "").strip()
+            op = (row.get("Operacion") or row.get("Operación") or "").strip()
+            prod = (row.get("ProductoPaginaWeb") or "").strip()
+            if site and city and op and prod:
+                combos.add((site, city, op, prod))
+    return combos
 
 
 def _gather_combinations() -> list[tuple[str, str, str, str]]:
     """Collect unique (PaginaWeb, Ciudad, Operacion, Producto) tuples.
 
     The information is extracted from every ``*_urls.csv`` file inside the
-    ``URLs`` directory.
+    ``URLs`` directory; files are parsed concurrently and merged at the end.
     """
 
     urls_dir = Path(__file__).resolve().parent.parent / "URLs"
-    combos: set[tuple[str, str, str, str]] = set()
 
-    for csv_file in urls_dir.glob("*_urls.csv"):
-        with open(csv_file, newline="", encoding="utf-8") as fh:
-            reader = csv.DictReader(fh)
-            for row in reader:
-                site = (row.get("PaginaWeb") or "").strip()
-                city = (row.get("Ciudad") or "").strip()
-                op = (row.get("Operacion") or row.get("Operación") or "").strip()
-                prod = (row.get("ProductoPaginaWeb") or "").strip()
-                if site and city and op and prod:
-                    combos.add((site, city, op, prod))
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        partial_sets = list(executor.map(_parse_one_csv, _iter_url_csvs(urls_dir)))
+
+    return sorted(set().union(*partial_sets))
 
-    return sorted(combos)
 
+# Month/year identifiers from Aug 2025 through Dec 2026 (e.g. ``Sep25``).
+_MONTHS: tuple[str, ...] = tuple(
+    f"{calendar.month_abbr[month]}{str(year)[-2:]}"
+    for year in range(2025, 2027)
+    for month in range(8 if year == 2025 else 1, 13)
+)
 
-def _generate_months() -> list[str]:
+
+def _generate_months() -> tuple[str, ...]:
     """Return month/year identifiers from Aug 2025 through Dec 2026."""
 
-    months: list[str] = []
-    for year in range(2025, 2027):
-        start_month = 8 if year == 2025 else 1
-        for month in range(start_month, 13):
-            months.append(f"{calendar.month_abbr[month]}{str(year)[-2:]}")
-    return months
+    return _MONTHS
+
+
+def _create_directories(
+    base_dir: Path,
+    combos: list[tuple[str, str, str, str]],
+    months: Sequence[str],
+    runs: list[str],
+) -> int:
+    """Create every folder of the tree, one level at a time.
+
+    Folders are created breadth-first (combination prefixes, then months,
+    then runs) so every parent exists before its children are requested.
+    Only the prefixes need ``makedirs``; months and runs sit directly under
+    a folder that is known to exist, so a plain ``mkdir`` is enough.
+    Returns the number of ``Run`` folders.
+    """
+
+    prefixes = [os.path.join(base_dir, *combo) for combo in combos]
+    month_dirs = [os.path.join(*parts) for parts in itertools.product(prefixes, months)]
+    run_dirs = [os.path.join(*parts) for parts in itertools.product(month_dirs, runs)]
+
+    for prefix in prefixes:
+        os.makedirs(prefix, exist_ok=True)
+
+    for level in (month_dirs, run_dirs):
+        for path in level:
+            try:
+                os.mkdir(path)
+            except FileExistsError:
+                pass
+
+    return len(run_dirs)
+
+
+# Everything after this marker changes on every run.
+_GENERATED_MARKER = "- **Generado**: ".encode("utf-8")
+
 
+def _readme_is_current(readme_path: str, data: bytes) -> bool:
+    """Return ``True`` if ``readme_path`` already matches ``data``.
 
-def create_data_structure() -> int:
-    """Create the full ``data`` folder structure and README templates."""
+    The generation timestamp is ignored.  The file size is checked first so
+    that only READMEs of the right length are read back.
+    """
+
+    try:
+        if os.stat(readme_path).st_size != len(data):
+            return False
+        with open(readme_path, "rb") as fh:
+            existing = fh.read()
+    except FileNotFoundError:
+        return False
+
+    cut = data.rfind(_GENERATED_MARKER)
+    return existing[:cut] == data[:cut]
+
+
+def _render_readme(
+    site: str, city: str, op: str, prod: str, month: str, run: str, generated: str
+) -> bytes:
+    """Return the encoded README contents for one ``Run`` folder.
+
+    The template is an f-string, so it is compiled into this function once
+    and no format table or mapping is built per README.
+    """
+
+    return (
+        f"# {site} - {city} - {op} - {prod}\n"
+        f"## {month} - Run {run}\n\n"
+        f"Esta carpeta contiene los archivos generados por el scraper de "
+        f"{site} para {city} ({op}, {prod}) durante {month}, ejecución {run}.\n\n"
+        "### Archivos esperados:\n"
+        f"- `{site}_{city}_{op}_{prod}_{month}_{run}.csv`\n"
+        f"- `metadata_{run}.json`\n"
+        f"- `execution_log_{run}.log`\n\n"
+        "### Información:\n"
+        f"- **Página web**: {site}\n"
+        f"- **Ciudad**: {city}\n"
+        f"- **Operación**: {op}\n"
+        f"- **Producto**: {prod}\n"
+        f"- **Período**: {month}\n"
+        f"- **Ejecución**: {run}\n"
+        f"- **Generado**: {generated}\n"
+    ).encode("utf-8")
+
+
+def _make_one(task: tuple[Path, str, str, str, str, str, str], generated: str) -> int:
+    """Write the ``README.md`` of a single, already created, ``Run`` folder.
+
+    Runs inside a worker process, so it only receives plain picklable values.
+    Returns ``1`` if the file was written and ``0`` if it was already current.
+    """
+
+    base_dir, site, city, op, prod, month, run = task
+    readme_path = os.path.join(base_dir, site, city, op, prod, month, run, "README.md")
+    data = _render_readme(site, city, op, prod, month, run, generated)
+
+    if _readme_is_current(readme_path, data):
+        return 0
+
+    fd = os.open(readme_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+    return 1
+
+
+def _make_batch(batch: tuple[tuple[Path, str, str, str, str, str, str], ...], generated: str) -> int:
+    """Write the READMEs of a batch of ``Run`` folders; return how many were written."""
+
+    return sum(_make_one(task, generated) for task in batch)
+
+
+def _batched(iterable, size: int):
+    """Yield successive tuples of at most ``size`` items from ``iterable``."""
+
+    iterator = iter(iterable)
+    while batch := tuple(itertools.islice(iterator, size)):
+        yield batch
+
+
+def _write_readme_archive(archive_path: Path, tasks, generated: str) -> int:
+    """Write every README into a single uncompressed tar at ``archive_path``.
+
+    Member names mirror the folder layout below ``data`` and end in
+    ``README.md``.  Returns the number of READMEs stored.
+    """
+
+    count = 0
+    mtime = dt.datetime.now().timestamp()
+    with tarfile.open(archive_path, "w") as tf:
+        for _base_dir, site, city, op, prod, month, run in tasks:
+            data = _render_readme(site, city, op, prod, month, run, generated)
+            info = tarfile.TarInfo(f"{site}/{city}/{op}/{prod}/{month}/{run}/README.md")
+            info.size = len(data)
+            info.mtime = mtime
+            tf.addfile(info, io.BytesIO(data))
+            count += 1
+    return count
+
+
+def create_data_structure(readme_archive: bool = False) -> int:
+    """Create the full ``data`` folder structure and README templates.
+
+    Folders are created up front, level by level; README files are then
+    independent of each other and are written from a process pool.  With
+    ``readme_archive`` the READMEs are stored in ``data/READMEs.tar``
+    instead of one file per ``Run`` folder.
+    """
 
     combos = _gather_combinations()
     months = _generate_months()
@@ -66,51 +242,48 @@ def create_data_structure() -> int:
 
     print("🏗️  Creando estructura completa de carpetas...")
     print("=" * 60)
+    print(f"📁 {len(combos)} combinaciones a procesar")
 
-    created_count = 0
-
-    for site, city, op, prod in combos:
-        print(f"\n📁 Creando estructura para: {site}/{city}/{op}/{prod}")
-
-        for month in months:
-            for run in runs:
-                folder_path = base_dir / site / city / op / prod / month / run
-                folder_path.mkdir(parents=True, exist_ok=True)
-                created_count += 1
-
-                readme_path = folder_path / "README.md"
-                readme_content = (
-                    f"# {site} - {city} - {op} - {prod}\n"
-                    f"## {month} - Run {run}\n\n"
-                    f"Esta carpeta contiene los archivos generados por el scraper de "
-                    f"{site} para {city} ({op}, {prod}) durante {month}, ejecución {run}.\n\n"
-                    "### Archivos esperados:\n"
-                    f"- `{site}_{city}_{op}_{prod}_{month}_{run}.csv`\n"
-                    f"- `metadata_{run}.json`\n"
-                    f"- `execution_log_{run}.log`\n\n"
-                    "### Información:\n"
-                    f"- **Página web**: {site}\n"
-                    f"- **Ciudad**: {city}\n"
-                    f"- **Operación**: {op}\n"
-                    f"- **Producto**: {prod}\n"
-                    f"- **Período**: {month}\n"
-                    f"- **Ejecución**: {run}\n"
-                    f"- **Generado**: {dt.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+    folder_count = _create_directories(base_dir, combos, months, runs)
+    generated = dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    tasks = (
+        (base_dir, *combo, month, run)
+        for combo, month, run in itertools.product(combos, months, runs)
+    )
+
+    if readme_archive:
+        archive_path = base_dir / "READMEs.tar"
+        readme_count = _write_readme_archive(archive_path, tasks, generated)
+        print(f"📦 README archivados en {archive_path}")
+    else:
+        with multiprocessing.Pool(os.cpu_count()) as pool:
+            readme_count = sum(
+                pool.imap_unordered(
+                    functools.partial(_make_batch, generated=generated),
+                    _batched(tasks, 256),
                 )
-                with open(readme_path, "w", encoding="utf-8") as fh:
-                    fh.write(readme_content)
+            )
 
     print("\n✅ Estructura completa creada:")
     print(f"   📁 {len(combos)} combinaciones de PaginaWeb/Ciudad/Operacion/Producto")
     print(f"   📁 {len(months)} meses")
     print(f"   📁 {len(runs)} ejecuciones por mes")
-    print(f"   📁 Total de carpetas: {created_count}")
-    print(f"   📄 Total de README: {created_count}")
+    print(f"   📁 Total de carpetas: {folder_count}")
+    print(f"   📄 Total de README: {folder_count} ({readme_count} escritos)")
 
-    return created_count
+    return folder_count
 
 
 if __name__ == "__main__":
-    created = create_data_structure()
+    parser = argparse.ArgumentParser(description="Crear la estructura de carpetas de data/")
+    parser.add_argument(
+        "--readme-archive",
+        action="store_true",
+        help="Guardar los README en data/READMEs.tar en lugar de un archivo por carpeta",
+    )
+    args = parser.parse_args()
+
+    created = create_data_structure(readme_archive=args.readme_archive)
     print(f"\n🎉 ¡Estructura completa! {created} carpetas creadas exitosamente")
 
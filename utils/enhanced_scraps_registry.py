@@ -5,15 +5,193 @@ Sistema de registro y control de todos los scraps programados basado en los
 archivos CSV individuales ubicados en el directorio ``URLs/``
 """
 
+import atexit
+import codecs
+import copy
 import csv
+import heapq
+import io
+import json
 import os
 import logging
+import mmap
+import re
+import stat
+import tempfile
+import threading
+import time
+import weakref
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import cached_property, lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from path_builder import build_path, PathInfo
-from url_utils import extract_url_column
+
+# orjson es opcional; acelera la lectura y escritura del diario JSONL
+try:
+    import orjson
+    orjson_available = True
+except ImportError:
+    orjson_available = False
+
+# pyarrow y pandas son opcionales y tardan en importarse, así que solo se
+# cargan al analizar el primer CSV grande (None: sin intentar; False: ausente)
+_pa = None
+_pd = None
+
+# Filas a partir de las cuales compensa analizar un CSV con pyarrow o pandas
+_FAST_PARSE_MIN_ROWS = 500
+
+
+def _pa_mod():
+    """Módulo ``pyarrow`` con ``pyarrow.csv`` cargado (``None`` si no está)"""
+    global _pa
+    if _pa is None:
+        try:
+            import pyarrow
+            import pyarrow.csv
+            _pa = pyarrow
+        except ImportError:
+            _pa = False
+    return _pa or None
+
+
+def _pd_mod():
+    """Módulo ``pandas`` (``None`` si no está instalado)"""
+    global _pd
+    if _pd is None:
+        try:
+            import pandas
+            _pd = pandas
+        except ImportError:
+            _pd = False
+    return _pd or None
+
+
+def _json_dumps(obj) -> bytes:
+    """Serializar ``obj`` a JSON en bytes UTF-8"""
+    if orjson_available:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def _json_loads(data: bytes):
+    """Deserializar JSON desde bytes UTF-8"""
+    if orjson_available:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@lru_cache(maxsize=8192)
+def _parse_iso(value: str) -> Optional[datetime]:
+    """Convertir una fecha ISO a ``datetime`` (``None`` si no es válida)
+
+    Las mismas fechas se consultan en cada llamada a los métodos de
+    consulta, por lo que el resultado se guarda en caché.
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _parse_records(value: str) -> int:
+    """Convertir la columna ``Records`` a entero (0 si está vacía o no es válida)"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _parse_with_pyarrow(pa, text: str) -> Tuple[List[str], List[List[str]]]:
+    """Analizar un CSV con pyarrow leyendo todas las columnas como texto
+
+    Lanza ``ValueError`` (``ArrowInvalid``) si alguna fila no tiene el mismo
+    número de columnas que la cabecera.
+    """
+    header = next(csv.reader(io.StringIO(text)), [])
+    if not header:
+        raise ValueError("CSV sin cabecera")
+
+    names = [str(idx) for idx in range(len(header))]
+    table = pa.csv.read_csv(
+        io.BytesIO(text.encode('utf-8')),
+        read_options=pa.csv.ReadOptions(column_names=names),
+        convert_options=pa.csv.ConvertOptions(
+            column_types={name: pa.string() for name in names},
+            strings_can_be_null=False,
+            quoted_strings_can_be_null=False,
+        ),
+    )
+    rows = [list(row) for row in zip(*(column.to_pylist() for column in table.columns))]
+    return rows[0], rows[1:]
+
+
+# Líneas de comentario de los CSV de URLs (``#`` tras espacios opcionales)
+_COMMENT_LINE = re.compile(r'^[^\S\n]*#.*\n?', re.MULTILINE)
+
+
+# Tamaño a partir del cual los CSV se decodifican directamente desde un mmap
+_MMAP_MIN_SIZE = 256 * 1024
+
+
+def _read_data_text(csv_path: Path, size: int = 0) -> str:
+    """Contenido de un CSV sin BOM ni líneas de comentario
+
+    El archivo se lee de una vez y los saltos de línea se normalizan a
+    ``\n``; los comentarios se eliminan con una sola expresión regular y
+    solo si el texto contiene ``#``. Los archivos de al menos
+    ``_MMAP_MIN_SIZE`` bytes (``size``) se decodifican desde un mmap, sin
+    copiar antes su contenido a un objeto ``bytes``.
+    """
+    with open(csv_path, 'rb') as f:
+        if size >= _MMAP_MIN_SIZE:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                text = codecs.decode(mm, 'utf-8-sig')
+        else:
+            text = f.read().decode('utf-8-sig')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    if '#' in text:
+        text = _COMMENT_LINE.sub('', text)
+    return text
+
+
+# Última ejecución de los scraps que nunca se ejecutaron (o con fecha inválida)
+_NEVER_RUN = datetime(1900, 1, 1)
+
+# Orden de los scraps pendientes: prioridad y después última ejecución.
+# Todas las entradas cargadas tienen ambas claves (``prioridad`` ya es int)
+_PENDING_SORT_KEY = itemgetter('prioridad', '_last_run_dt')
+
+# Normalización de los ids de URL en una sola pasada. Los espacios solo se
+# sustituyen en ciudad y producto (ver ``_load_urls_file``), como siempre
+_ID_TRANS = str.maketrans({
+    '/': '_',
+    '-': '_',
+    'ñ': 'n',
+    'é': 'e',
+    'í': 'i',
+    'ó': 'o',
+    'ú': 'u'
+})
+
+# Instancias vivas; un único gancho atexit cierra las que registraron cambios
+# sin mantenerlas vivas hasta el final del proceso
+_LIVE_REGISTRIES: 'weakref.WeakSet[EnhancedScrapsRegistry]' = weakref.WeakSet()
+
+
+def _close_registries_at_exit() -> None:
+    for registry in list(_LIVE_REGISTRIES):
+        registry._close_at_exit()
+
+
+atexit.register(_close_registries_at_exit)
 
 class EnhancedScrapsRegistry:
     """
@@ -24,6 +202,28 @@ class EnhancedScrapsRegistry:
     def __init__(self):
         self.project_root = Path(__file__).parent.parent
         self.registry_file = self.project_root / 'data' / 'scraps_registry.csv'
+        # Diario de actualizaciones pendientes de volcar a los CSV de URLs
+        self.updates_file = self.project_root / 'data' / 'scraps_updates.jsonl'
+        self._pending_updates = 0
+        # Líneas del diario aún no escritas (ver ``batch``)
+        self._journal_buffer: List[bytes] = []
+        # Profundidad de ``batch`` de cada hilo
+        self._batch_state = threading.local()
+        # Protege el búfer del diario y la compactación frente a los hilos
+        # del orquestador que actualizan scraps a la vez
+        self._lock = threading.RLock()
+        # Esta instancia registró actualizaciones que no se han compactado
+        self._dirty = False
+        # Directorios ya creados por esta instancia
+        self._known_dirs: set = set()
+        # CSV cuyas columnas de progreso ya se comprobaron
+        self._checked_csvs: set = set()
+        # Caché de CSV leídos: ruta -> ((mtime_ns, tamaño), cabecera, filas)
+        self._csv_cache: Dict[Path, Tuple[Tuple[int, int], List[str], List[List[str]]]] = {}
+        # Último listado de CSV del directorio de URLs: (directorio, instante, archivos)
+        self._csv_listing: Optional[Tuple[Path, float, List[Path]]] = None
+        # Rutas de los CSV de URLs por nombre de archivo
+        self._csv_paths: Dict[str, Path] = {}
         self.setup_logging()
 
         # Directorio que contiene los archivos de URLs individuales
@@ -32,8 +232,8 @@ class EnhancedScrapsRegistry:
         # Migrar datos del registro antiguo si existe
         self.migrate_registry_to_csv_files()
 
-        # Cargar las URLs con información de progreso
-        self.urls_registry = self.load_urls_from_csv()
+        # Volcar a los CSV lo registrado por esta instancia al terminar el proceso
+        _LIVE_REGISTRIES.add(self)
 
         # Mapeo de sitios web
         self.websites = {
@@ -45,34 +245,222 @@ class EnhancedScrapsRegistry:
             6: "trovit"
         }
 
+    @cached_property
+    def urls_registry(self) -> List[Dict]:
+        """URLs con información de progreso, cargadas al primer acceso"""
+        return self.load_urls_from_csv()
+
+    @cached_property
+    def _by_id(self) -> Dict[str, Dict]:
+        """Índice de ``urls_registry`` por id"""
+        return self._index_by_id(self.urls_registry)
+
+    @cached_property
+    def _by_website(self) -> Dict[str, List[Dict]]:
+        """URLs de ``urls_registry`` agrupadas por sitio web (en minúsculas)"""
+        by_website: Dict[str, List[Dict]] = defaultdict(list)
+        for scrap in self.urls_registry:
+            by_website[scrap['website'].lower()].append(scrap)
+        return by_website
+
+    def _scraps_for(self, website: Optional[str]) -> List[Dict]:
+        """URLs de un sitio web, o todas si no se indica ninguno"""
+        if not website:
+            return self.urls_registry
+        return self._by_website.get(website.lower(), [])
+
+    # Archivo CSV de URLs de cada sitio web del antiguo scraps_registry.csv
+    _MIGRATION_FILES = {
+        'Inmuebles24': 'inm24_urls.csv',
+        'Casas_y_terrenos': 'cyt_urls.csv',
+        'lamudi': 'lam_urls.csv',
+        'mitula': 'mit_urls.csv',
+        'propiedades': 'prop_urls.csv',
+        'trovit': 'tro_urls.csv'
+    }
+
     # Columnas de progreso que se almacenarán en cada CSV de URLs
     progress_columns = ['Status', 'LastRun', 'NextRun', 'ScrapOfMonth', 'Records']
 
+    # Prioridad de cada sitio web (menor valor = mayor prioridad)
+    _PRIORITIES = {
+        'Inmuebles24': 1,
+        'Casas_y_terrenos': 2,
+        'lamudi': 3,
+        'mitula': 4,
+        'propiedades': 5,
+        'trovit': 6
+    }
+
+    # Días entre ejecuciones de cada sitio web
+    _INTERVALS = {
+        'Inmuebles24': 15,  # Cada 15 días como especificaste
+        'Casas_y_terrenos': 7,
+        'lamudi': 10,
+        'mitula': 14,
+        'propiedades': 21,
+        'trovit': 14
+    }
+
+    # Correspondencia entre los campos del registro y las columnas de progreso
+    progress_fields = {
+        'status': 'Status',
+        'last_run': 'LastRun',
+        'next_run': 'NextRun',
+        'scrap_of_month': 'ScrapOfMonth',
+        'records': 'Records'
+    }
+
+    # Actualizaciones acumuladas en el diario antes de volcarlas a los CSV
+    compact_threshold = 200
+
+    # Segundos durante los que se reutiliza el listado del directorio de URLs
+    csv_listing_ttl = 5.0
+
+    def _list_csvs(self) -> List[Path]:
+        """CSV del directorio de URLs en orden alfabético
+
+        Se listan con una sola llamada a ``os.scandir`` y el resultado se
+        reutiliza durante ``csv_listing_ttl`` segundos. Lanza
+        ``FileNotFoundError`` si el directorio no existe.
+        """
+        now = time.monotonic()
+        cached = self._csv_listing
+        if (cached is not None and cached[0] == self.csv_urls_dir
+                and now - cached[1] < self.csv_listing_ttl):
+            return cached[2]
+
+        with os.scandir(self.csv_urls_dir) as entries:
+            csv_files = sorted(
+                Path(entry.path) for entry in entries
+                if entry.name.endswith('.csv') and entry.is_file()
+            )
+        self._csv_listing = (self.csv_urls_dir, now, csv_files)
+        self._csv_paths = {path.name: path for path in csv_files}
+        return csv_files
+
+    def _csv_path(self, csv_filename: str) -> Path:
+        """Ruta de un CSV de URLs, reutilizando la del último listado"""
+        path = self._csv_paths.get(csv_filename)
+        if path is None:
+            path = self._csv_paths[csv_filename] = self.csv_urls_dir / csv_filename
+        return path
+
     def ensure_csv_progress_columns(self, csv_path: Path) -> None:
-        """Asegurar que el archivo CSV contenga las columnas de progreso"""
-        try:
-            with open(csv_path, 'r', encoding='utf-8-sig') as f:
-                reader = csv.DictReader(row for row in f if not row.lstrip().startswith('#'))
-                fieldnames = reader.fieldnames or []
-                # Si todas las columnas existen, no hacer nada
-                if all(col in fieldnames for col in self.progress_columns):
-                    return
+        """Asegurar que el archivo CSV contenga las columnas de progreso
 
-                rows = list(reader)
+        La comprobación se hace una sola vez por archivo y por instancia.
+        """
+        if csv_path in self._checked_csvs:
+            return
+
+        try:
+            header, rows = self._read_csv(csv_path)
+            # Si todas las columnas existen, no hacer nada
+            if all(col in header for col in self.progress_columns):
+                self._checked_csvs.add(csv_path)
+                return
 
             # Añadir columnas faltantes con valores por defecto
-            new_fieldnames = fieldnames + [col for col in self.progress_columns if col not in fieldnames]
-            for row in rows:
-                for col in self.progress_columns:
-                    row.setdefault(col, 'False' if col == 'ScrapOfMonth' else '')
-
-            with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=new_fieldnames)
-                writer.writeheader()
-                writer.writerows(rows)
+            new_header = list(header) + [col for col in self.progress_columns if col not in header]
+            defaults = ['False' if col == 'ScrapOfMonth' else '' for col in new_header]
+            new_rows = [row + defaults[len(row):] for row in rows]
+
+            self._write_csv(csv_path, new_header, new_rows)
+            self._checked_csvs.add(csv_path)
 
         except Exception as e:
-            self.logger.error(f"Error asegurando columnas en {csv_path}: {e}")
+            self.logger.error("Error asegurando columnas en %s: %s", csv_path, e)
+
+    def _read_csv(self, csv_path: Path) -> Tuple[List[str], List[List[str]]]:
+        """Leer un CSV de URLs sin comentarios ni filas vacías
+
+        Devuelve la cabecera y las filas como listas. El resultado se guarda en
+        caché y solo se vuelve a analizar el archivo si cambia su fecha de
+        modificación o su tamaño; las listas devueltas no deben modificarse.
+        """
+        st = os.stat(csv_path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._csv_cache.get(csv_path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1], cached[2]
+
+        header, rows = self._parse_csv_text(_read_data_text(csv_path, st.st_size))
+
+        self._csv_cache[csv_path] = (stamp, header, rows)
+        return header, rows
+
+    @staticmethod
+    def _parse_csv_text(text: str) -> Tuple[List[str], List[List[str]]]:
+        """Analizar el texto de un CSV en cabecera y filas
+
+        Los CSV de al menos ``_FAST_PARSE_MIN_ROWS`` filas se analizan con
+        pyarrow o, en su defecto, pandas cuando están disponibles. Los más
+        pequeños, o los que tienen filas con más columnas que la cabecera, se
+        analizan con el módulo ``csv``, que para pocas filas es más rápido que
+        importar y preparar cualquiera de los dos.
+        """
+        large = text.count('\n') >= _FAST_PARSE_MIN_ROWS
+
+        pa = _pa_mod() if large else None
+        if pa is not None:
+            try:
+                return _parse_with_pyarrow(pa, text)
+            except ValueError:
+                pass
+
+        pd = _pd_mod() if large else None
+        if pd is not None:
+            try:
+                df = pd.read_csv(io.StringIO(text), header=None, dtype=str, na_filter=False)
+                table = df.values.tolist()
+                return table[0], table[1:]
+            except ValueError:
+                pass
+
+        reader = csv.reader(io.StringIO(text))
+        header = next(reader, [])
+        return header, [row for row in reader if row]
+
+    def _read_csv_rows(self, csv_path: Path) -> Tuple[List[str], List[List[str]]]:
+        """Leer un CSV de URLs como copias modificables del tamaño de la cabecera"""
+        header, rows = self._read_csv(csv_path)
+        width = len(header)
+        padding = [''] * width
+        return list(header), [(row + padding[len(row):])[:width] for row in rows]
+
+    def _write_csv(self, csv_path: Path, header: List[str], rows: List[List[str]]) -> None:
+        """Escribir un CSV de URLs y actualizar su entrada en la caché
+
+        El contenido se escribe en un archivo temporal del mismo directorio que
+        luego reemplaza al original, de modo que un lector nunca ve un CSV a
+        medio escribir y un fallo no deja el archivo truncado. Las filas pasan
+        a formar parte de la caché y no deben modificarse después.
+        """
+        tmp = tempfile.NamedTemporaryFile(
+            'w', newline='', encoding='utf-8', dir=csv_path.parent,
+            prefix=f'.{csv_path.name}.', suffix='.tmp', delete=False
+        )
+        try:
+            with tmp as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                writer.writerows(rows)
+            # Conservar los permisos del archivo original
+            try:
+                os.chmod(tmp.name, stat.S_IMODE(os.stat(csv_path).st_mode))
+            except FileNotFoundError:
+                pass
+            os.replace(tmp.name, csv_path)
+        except BaseException:
+            try:
+                os.remove(tmp.name)
+            except OSError:
+                pass
+            raise
+
+        st = os.stat(csv_path)
+        self._csv_cache[csv_path] = ((st.st_mtime_ns, st.st_size), list(header), rows)
 
     def migrate_registry_to_csv_files(self) -> None:
         """Migrar datos del registro central a los archivos CSV individuales"""
@@ -85,24 +473,15 @@ class EnhancedScrapsRegistry:
                 reader = csv.DictReader(f)
                 registry_rows = list(reader)
 
+            # Agrupar las filas del registro por archivo CSV de destino
+            by_file: Dict[str, List[Dict]] = defaultdict(list)
             for reg_row in registry_rows:
                 website = reg_row.get('website') or reg_row.get('PaginaWeb')
-                if not website:
-                    continue
-
-                # Mapear website a archivo CSV
-                file_map = {
-                    'Inmuebles24': 'inm24_urls.csv',
-                    'Casas_y_terrenos': 'cyt_urls.csv',
-                    'lamudi': 'lam_urls.csv',
-                    'mitula': 'mit_urls.csv',
-                    'propiedades': 'prop_urls.csv',
-                    'trovit': 'tro_urls.csv'
-                }
-                csv_filename = file_map.get(website)
-                if not csv_filename:
-                    continue
+                csv_filename = self._MIGRATION_FILES.get(website)
+                if csv_filename:
+                    by_file[csv_filename].append(reg_row)
 
+            for csv_filename, file_rows in by_file.items():
                 csv_path = self.csv_urls_dir / csv_filename
                 if not csv_path.exists():
                     continue
@@ -110,38 +489,40 @@ class EnhancedScrapsRegistry:
                 self.ensure_csv_progress_columns(csv_path)
 
                 try:
-                    with open(csv_path, 'r', encoding='utf-8-sig') as f:
-                        reader = csv.DictReader(row for row in f if not row.lstrip().startswith('#'))
-                        fieldnames = reader.fieldnames or []
-                        rows = list(reader)
-
-                    # Buscar fila por URL
-                    match_idx = None
+                    header, rows = self._read_csv_rows(csv_path)
+                    col_idx = {name: i for i, name in enumerate(header)}
+                    url_idx = col_idx.get('URL')
+                    if url_idx is None:
+                        continue
+
+                    # Índice URL -> fila; ante duplicados gana la primera aparición
+                    url_to_idx: Dict[str, int] = {}
                     for idx, row in enumerate(rows):
-                        if row.get('URL', '').strip() == reg_row.get('url', '').strip():
-                            match_idx = idx
-                            break
+                        url_to_idx.setdefault(row[url_idx].strip(), idx)
+
+                    matched = False
+                    for reg_row in file_rows:
+                        match_idx = url_to_idx.get(reg_row.get('url', '').strip())
+                        if match_idx is None:
+                            continue
 
-                    if match_idx is not None:
                         row = rows[match_idx]
-                        row['Status'] = reg_row.get('ultimo_estado', '')
-                        row['LastRun'] = reg_row.get('ultima_ejecucion', '')
-                        row['NextRun'] = reg_row.get('proxima_ejecucion', '')
+                        row[col_idx['Status']] = reg_row.get('ultimo_estado', '')
+                        row[col_idx['LastRun']] = reg_row.get('ultima_ejecucion', '')
+                        row[col_idx['NextRun']] = reg_row.get('proxima_ejecucion', '')
                         # Guardar mes de la última ejecución como ScrapOfMonth
                         last_run = reg_row.get('ultima_ejecucion', '')
-                        row['ScrapOfMonth'] = last_run[:7] if last_run else ''
-                        row['Records'] = reg_row.get('registros_extraidos', '')
-                        rows[match_idx] = row
-
-                        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-                            writer = csv.DictWriter(f, fieldnames=fieldnames)
-                            writer.writeheader()
-                            writer.writerows(rows)
+                        row[col_idx['ScrapOfMonth']] = last_run[:7] if last_run else ''
+                        row[col_idx['Records']] = reg_row.get('registros_extraidos', '')
+                        matched = True
+
+                    if matched:
+                        self._write_csv(csv_path, header, rows)
                 except Exception as e:
-                    self.logger.error(f"Error migrando datos a {csv_path}: {e}")
+                    self.logger.error("Error migrando datos a %s: %s", csv_path, e)
 
         except Exception as e:
-            self.logger.error(f"Error leyendo scraps_registry.csv: {e}")
+            self.logger.error("Error leyendo scraps_registry.csv: %s", e)
         finally:
             try:
                 os.remove(self.registry_file)
@@ -153,96 +534,344 @@ class EnhancedScrapsRegistry:
         """Cargar todas las URLs desde los archivos CSV del directorio URLs/"""
         urls_list: List[Dict] = []
 
-        if not self.csv_urls_dir.exists():
-            self.logger.warning(f"Directorio de URLs no encontrado: {self.csv_urls_dir}")
+        # Procesar los archivos en orden alfabético para asegurar consistencia
+        try:
+            csv_files = self._list_csvs()
+        except FileNotFoundError:
+            self.logger.warning("Directorio de URLs no encontrado: %s", self.csv_urls_dir)
             return urls_list
 
-        # Procesar los archivos en orden alfabético para asegurar consistencia
-        csv_files = sorted(self.csv_urls_dir.glob('*.csv'))
         if not csv_files:
-            self.logger.warning(f"No se encontraron archivos CSV en {self.csv_urls_dir}")
+            self.logger.warning("No se encontraron archivos CSV en %s", self.csv_urls_dir)
             return urls_list
 
-        for csv_file in csv_files:
+        # Cada archivo se procesa en un hilo; map conserva el orden alfabético
+        with ThreadPoolExecutor(max_workers=min(8, len(csv_files))) as executor:
+            for file_urls in executor.map(self._load_urls_file, csv_files):
+                urls_list.extend(file_urls)
+
+        # Aplicar las actualizaciones registradas que aún no están en los CSV
+        self._replay_updates(urls_list)
+
+        self.logger.info(
+            "Cargadas %d URLs desde %d archivos en %s",
+            len(urls_list), len(csv_files), self.csv_urls_dir
+        )
+        return urls_list
+
+    def _load_urls_file(self, csv_file: Path) -> List[Dict]:
+        """Cargar las URLs de un único archivo CSV"""
+        # Métodos ``get`` ligados una vez para el bucle por fila
+        priority_of = self._PRIORITIES.get
+        interval_of = self._INTERVALS.get
+        urls_list: List[Dict] = []
+
+        try:
+            # Asegurar que existan las columnas de progreso
+            self.ensure_csv_progress_columns(csv_file)
+
+            header, rows = self._read_csv(csv_file)
+            # Posición de cada columna; el índice ``width`` apunta a la
+            # celda vacía que se añade a cada fila para columnas ausentes
+            width = len(header)
+            columns = {name: idx for idx, name in enumerate(header)}
+            col_pagina = columns.get('PaginaWeb', width)
+            col_ciudad = columns.get('Ciudad', width)
+            col_operacion = columns.get('Operacion', columns.get('Operación', width))
+            col_producto = columns.get('ProductoPaginaWeb', width)
+            col_status = columns.get('Status', width)
+            col_last_run = columns.get('LastRun', width)
+            col_next_run = columns.get('NextRun', width)
+            col_scrap_of_month = columns.get('ScrapOfMonth', width)
+            col_records = columns.get('Records', width)
+            # Misma resolución de la columna URL que extract_url_column
+            url_cols = [columns[key] for key in ('URL', 'Url', 'url') if key in columns]
+            col_url_fallback = 4 if width > 4 else width
+
+            for row_num, row in enumerate(rows, start=1):
+                # Las filas en caché son compartidas: rellenar sobre una copia
+                if len(row) == width:
+                    row = row + ['']
+                else:
+                    row = (row + [''] * width)[:width] + ['']
+
+                pagina_web = row[col_pagina].strip()
+                ciudad = row[col_ciudad].strip()
+                operacion = row[col_operacion].strip()
+                producto = row[col_producto].strip()
+                url = next(
+                    (row[idx].strip() for idx in url_cols if row[idx]),
+                    row[col_url_fallback].strip()
+                )
+
+                if url and pagina_web:
+                    url_id = (
+                        f"{pagina_web}_{ciudad.replace(' ', '_')}_"
+                        f"{operacion}_{producto.replace(' ', '_')}"
+                    ).lower().translate(_ID_TRANS)
+
+                    url_data = {
+                        'id': url_id,
+                        'website': pagina_web,
+                        'ciudad': ciudad,
+                        'operacion': operacion,
+                        'producto': producto,
+                        'url': url,
+                        'prioridad': priority_of(pagina_web, 10),
+                        'intervalo_dias': interval_of(pagina_web, 30),
+                        'activo': True,
+                        # Guardar el número de fila para respetar el orden del CSV
+                        'csv_row': row_num,
+                        'csv_file': csv_file.name,
+                        'status': row[col_status],
+                        'last_run': row[col_last_run],
+                        'next_run': row[col_next_run],
+                        'scrap_of_month': row[col_scrap_of_month],
+                        'records': row[col_records],
+                        # Fechas ya convertidas para filtrar y ordenar
+                        '_next_run_dt': _parse_iso(row[col_next_run]),
+                        '_last_run_dt': _parse_iso(row[col_last_run]) or _NEVER_RUN,
+                        '_records': _parse_records(row[col_records])
+                    }
+                    urls_list.append(url_data)
+        except Exception as e:
+            self.logger.error("Error cargando URLs desde %s: %s", csv_file, e)
+
+        return urls_list
+
+    @staticmethod
+    def _index_by_id(urls_list: List[Dict]) -> Dict[str, Dict]:
+        """Indexar las URLs por id conservando la primera aparición"""
+        by_id: Dict[str, Dict] = {}
+        for scrap in urls_list:
+            by_id.setdefault(scrap['id'], scrap)
+        return by_id
+
+    @property
+    def compacting_file(self) -> Path:
+        """Diario apartado por una compactación en curso (o interrumpida)"""
+        return self.updates_file.with_name(self.updates_file.name + '.compacting')
+
+    def _read_updates(self, journal: Optional[Path] = None) -> List[Dict]:
+        """Leer las actualizaciones pendientes del diario JSONL
+
+        Sin ``journal`` se leen, en orden, el diario apartado por una
+        compactación que no terminó y el diario actual.
+        """
+        if journal is None:
+            return self._read_updates(self.compacting_file) + self._read_updates(self.updates_file)
+
+        updates: List[Dict] = []
+        if not journal.exists():
+            return updates
+
+        with open(journal, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    updates.append(_json_loads(line))
+                except json.JSONDecodeError:
+                    self.logger.warning("Línea inválida en %s: %r", journal.name, line[:80])
+        return updates
+
+    def _replay_updates(self, urls_list: List[Dict]) -> None:
+        """Aplicar sobre las URLs cargadas las actualizaciones del diario"""
+        try:
+            updates = self._read_updates()
+        except Exception as e:
+            self.logger.error("Error leyendo %s: %s", self.updates_file, e)
+            return
+
+        self._pending_updates = len(updates)
+        if not updates:
+            return
+
+        by_row = {(scrap['csv_file'], scrap['csv_row']): scrap for scrap in urls_list}
+        by_id = self._index_by_id(urls_list)
+        for update in updates:
+            scrap = by_row.get((update.get('csv_file'), update.get('csv_row')))
+            if scrap is None or scrap['id'] != update.get('id'):
+                # El CSV cambió desde que se registró: buscar el scrap por id
+                scrap = by_id.get(update.get('id'))
+                if scrap is None:
+                    self.logger.warning(
+                        "Actualización de %s descartada: el scrap ya no está en los CSV", update.get('id')
+                    )
+                    continue
+            scrap.update({key: update[key] for key in self.progress_fields if key in update})
+            scrap['_next_run_dt'] = _parse_iso(scrap['next_run'])
+            scrap['_last_run_dt'] = _parse_iso(scrap['last_run']) or _NEVER_RUN
+            scrap['_records'] = _parse_records(scrap['records'])
+
+    def _load_file_if_exists(self, csv_file: str) -> List[Dict]:
+        """URLs de un CSV por nombre (vacío si el archivo ya no existe)"""
+        csv_path = self._csv_path(csv_file)
+        return self._load_urls_file(csv_path) if csv_path.exists() else []
+
+    def compact_updates(self) -> bool:
+        """Volcar el diario de actualizaciones a los CSV de URLs y vaciarlo"""
+        with self._lock:
+            return self._compact_updates()
+
+    def _compact_updates(self) -> bool:
+        # Apartar el diario antes de leerlo: lo que otros hilos o procesos
+        # añadan mientras tanto va a un diario nuevo y no se pierde. Si quedó
+        # uno apartado por una compactación interrumpida, se vuelca primero.
+        compacting = self.compacting_file
+        leftover = compacting.exists()
+        if not leftover:
             try:
-                # Asegurar que existan las columnas de progreso
-                self.ensure_csv_progress_columns(csv_file)
+                os.replace(self.updates_file, compacting)
+            except FileNotFoundError:
+                return True
+            except OSError as e:
+                self.logger.error("Error apartando %s: %s", self.updates_file, e)
+                return False
 
-                with open(csv_file, 'r', encoding='utf-8-sig') as f:
-                    reader = csv.DictReader(
-                        row for row in f if not row.lstrip().startswith('#')
+        try:
+            updates = self._read_updates(compacting)
+        except Exception as e:
+            self.logger.error("Error leyendo %s: %s", compacting, e)
+            return False
+
+        # Agrupar por archivo; la última actualización de cada fila prevalece.
+        # Solo se aplica en la fila registrada si esta sigue siendo el mismo
+        # scrap; si el CSV cambió, se busca la fila actual de ese id.
+        by_file: Dict[str, Dict[int, Dict]] = {}
+        row_ids: Dict[str, Dict[int, str]] = {}
+        id_locations: Optional[Dict[str, Tuple[str, int]]] = None
+        for update in updates:
+            csv_file, csv_row = update.get('csv_file'), update.get('csv_row')
+            if csv_file not in row_ids:
+                row_ids[csv_file] = {
+                    scrap['csv_row']: scrap['id'] for scrap in self._load_file_if_exists(csv_file)
+                }
+            if row_ids[csv_file].get(csv_row) != update.get('id'):
+                if id_locations is None:
+                    id_locations = {}
+                    for path in self._list_csvs():
+                        for scrap in self._load_urls_file(path):
+                            id_locations.setdefault(scrap['id'], (scrap['csv_file'], scrap['csv_row']))
+                location = id_locations.get(update.get('id'))
+                if location is None:
+                    self.logger.warning(
+                        "Actualización de %s descartada: el scrap ya no está en los CSV", update.get('id')
                     )
+                    continue
+                csv_file, csv_row = location
+            by_file.setdefault(csv_file, {})[csv_row] = update
+
+        success = True
+        for csv_file, row_updates in by_file.items():
+            csv_path = self._csv_path(csv_file)
+            if not csv_path.exists():
+                self.logger.warning("Archivo %s no encontrado al compactar actualizaciones", csv_path)
+                continue
+
+            try:
+                self.ensure_csv_progress_columns(csv_path)
+                header, rows = self._read_csv_rows(csv_path)
+                columns = [
+                    (key, header.index(column)) for key, column in self.progress_fields.items()
+                ]
+
+                for row_num, update in row_updates.items():
+                    row_index = row_num - 1
+                    if row_index >= len(rows):
+                        self.logger.warning("Índice de fila inválido para %s", update.get('id'))
+                        continue
+                    row = rows[row_index]
+                    for key, idx in columns:
+                        if key in update:
+                            row[idx] = update[key]
+
+                self._write_csv(csv_path, header, rows)
 
-                    for row_num, row in enumerate(reader, start=1):
-                        pagina_web = row.get('PaginaWeb', '').strip()
-                        ciudad = row.get('Ciudad', '').strip()
-                        operacion = row.get('Operacion', row.get('Operación', '')).strip()
-                        producto = row.get('ProductoPaginaWeb', '').strip()
-                        url = extract_url_column(row)
-
-                        if url and pagina_web:
-                            url_id = f"{pagina_web.lower()}_{ciudad.lower().replace(' ', '_')}_{operacion.lower()}_{producto.lower().replace(' ', '_')}"
-                            url_id = (
-                                url_id.replace('/', '_')
-                                .replace('-', '_')
-                                .replace('ñ', 'n')
-                                .replace('é', 'e')
-                                .replace('í', 'i')
-                                .replace('ó', 'o')
-                                .replace('ú', 'u')
-                            )
-
-                            url_data = {
-                                'id': url_id,
-                                'website': pagina_web,
-                                'ciudad': ciudad,
-                                'operacion': operacion,
-                                'producto': producto,
-                                'url': url,
-                                'prioridad': self.get_website_priority(pagina_web),
-                                'intervalo_dias': self.get_interval_days(pagina_web),
-                                'activo': True,
-                                # Guardar el número de fila para respetar el orden del CSV
-                                'csv_row': row_num,
-                                'csv_file': csv_file.name,
-                                'status': row.get('Status', ''),
-                                'last_run': row.get('LastRun', ''),
-                                'next_run': row.get('NextRun', ''),
-                                'scrap_of_month': row.get('ScrapOfMonth', ''),
-                                'records': row.get('Records', '')
-                            }
-                            urls_list.append(url_data)
             except Exception as e:
-                self.logger.error(f"Error cargando URLs desde {csv_file}: {e}")
+                self.logger.error("Error compactando actualizaciones en %s: %s", csv_path, e)
+                success = False
 
-        self.logger.info(
-            f"Cargadas {len(urls_list)} URLs desde {len(csv_files)} archivos en {self.csv_urls_dir}"
-        )
-        return urls_list
+        # Conservar el diario apartado si algún archivo falló; se vuelve a
+        # leer al cargar y a aplicar en la siguiente compactación (es inocuo)
+        if success:
+            try:
+                os.remove(compacting)
+            except OSError:
+                pass
+            self._pending_updates = 0
+            self._dirty = False
+            if updates:
+                self.logger.info("%d actualizaciones volcadas a %d archivos CSV", len(updates), len(by_file))
+            if leftover:
+                return self._compact_updates()
+
+        return success
+
+    def flush(self) -> None:
+        """Escribir en el diario las actualizaciones acumuladas en memoria"""
+        with self._lock:
+            if not self._journal_buffer:
+                return
+
+            # Retirar el búfer antes de escribir; si la escritura falla las
+            # líneas vuelven al búfer
+            lines, self._journal_buffer = self._journal_buffer, []
+            try:
+                updates_dir = self.updates_file.parent
+                if updates_dir not in self._known_dirs:
+                    updates_dir.mkdir(parents=True, exist_ok=True)
+                    self._known_dirs.add(updates_dir)
+                with open(self.updates_file, 'ab') as f:
+                    f.write(b''.join(lines))
+            except Exception:
+                self._journal_buffer[:0] = lines
+                raise
+
+            self._pending_updates += len(lines)
+            if self._pending_updates >= self.compact_threshold:
+                self.compact_updates()
+
+    @contextmanager
+    def batch(self):
+        """Agrupar varias actualizaciones en una sola escritura del diario
+
+        Dentro del bloque ``update_scrap_execution`` solo actualiza la memoria;
+        al salir se escriben todas las líneas juntas. El bloque solo afecta
+        al hilo que lo abre; los demás siguen escribiendo sus actualizaciones
+        al momento.
+        """
+        state = self._batch_state
+        state.depth = getattr(state, 'depth', 0) + 1
+        try:
+            yield self
+        finally:
+            state.depth -= 1
+            if state.depth == 0:
+                self.flush()
+
+    def close(self) -> None:
+        """Volcar las actualizaciones pendientes antes de terminar"""
+        self.flush()
+        self.compact_updates()
+
+    def _close_at_exit(self) -> None:
+        """Cerrar al salir del proceso solo si esta instancia registró cambios
+
+        Así un proceso que únicamente consulta el registro no compacta el
+        diario que otro proceso sigue escribiendo.
+        """
+        if self._dirty or self._journal_buffer:
+            self.close()
     
     def get_website_priority(self, website: str) -> int:
         """Obtener prioridad según el sitio web"""
-        priorities = {
-            'Inmuebles24': 1,
-            'Casas_y_terrenos': 2,
-            'lamudi': 3,
-            'mitula': 4,
-            'propiedades': 5,
-            'trovit': 6
-        }
-        return priorities.get(website, 10)
+        return self._PRIORITIES.get(website, 10)
     
     def get_interval_days(self, website: str) -> int:
         """Obtener intervalo de días según el sitio web"""
-        intervals = {
-            'Inmuebles24': 15,  # Cada 15 días como especificaste
-            'Casas_y_terrenos': 7,
-            'lamudi': 10,
-            'mitula': 14,
-            'propiedades': 21,
-            'trovit': 14
-        }
-        return intervals.get(website, 30)
+        return self._INTERVALS.get(website, 30)
     
     def setup_logging(self):
         """Configurar logging"""
@@ -263,120 +892,125 @@ class EnhancedScrapsRegistry:
         """Método mantenido por compatibilidad (sin uso)"""
         self.logger.debug("initialize_registry ya no es necesario")
     
-    def get_pending_scraps(self, website: str = None) -> List[Dict]:
-        """Obtener scraps pendientes de ejecución"""
-        now = datetime.now()
-        pending_scraps: List[Dict] = []
+    def _iter_pending(self, website: Optional[str] = None, now: Optional[datetime] = None):
+        """Recorrer, sin ordenar, los scraps activos cuya ejecución ya toca"""
+        if now is None:
+            now = datetime.now()
+        for scrap in self._scraps_for(website):
+            if not scrap.get('activo', True):
+                continue
 
-        try:
-            for scrap in self.urls_registry:
-                if not scrap.get('activo', True):
-                    continue
+            next_run_dt = scrap.get('_next_run_dt')
+            if next_run_dt is None or now >= next_run_dt:
+                yield scrap
 
-                if website and scrap['website'].lower() != website.lower():
-                    continue
+    def get_pending_scraps(self, website: str = None, limit: Optional[int] = None) -> List[Dict]:
+        """Obtener scraps pendientes de ejecución
 
-                next_run = scrap.get('next_run', '')
+        Con ``limit`` solo se devuelven los ``limit`` primeros en orden de
+        prioridad, sin ordenar la lista completa.
+        """
+        try:
+            if limit is not None:
+                return heapq.nsmallest(limit, self._iter_pending(website), key=_PENDING_SORT_KEY)
 
-                if not next_run:
-                    pending_scraps.append(scrap)
-                else:
-                    try:
-                        if now >= datetime.fromisoformat(next_run):
-                            pending_scraps.append(scrap)
-                    except ValueError:
-                        pending_scraps.append(scrap)
-
-            pending_scraps.sort(
-                key=lambda x: (int(x.get('prioridad', 10)), x.get('last_run', '1900-01-01'))
-            )
+            pending_scraps = list(self._iter_pending(website))
+            pending_scraps.sort(key=_PENDING_SORT_KEY)
             return pending_scraps
 
         except Exception as e:
-            self.logger.error(f"Error obteniendo scraps pendientes: {e}")
+            self.logger.error("Error obteniendo scraps pendientes: %s", e)
             return []
 
     def get_next_scraps_to_run(self, max_count: int = 4) -> List[Dict]:
-        """Obtener los próximos scraps a ejecutar según prioridades"""
-        pending_scraps = self.get_pending_scraps()
-        selected_scraps: List[Dict] = []
-        used_websites = set()
-
-        for scrap in pending_scraps:
-            if len(selected_scraps) >= max_count:
-                break
-            if scrap['website'] not in used_websites:
-                selected_scraps.append(scrap)
-                used_websites.add(scrap['website'])
-
-        return selected_scraps
-    
+        """Obtener los próximos scraps a ejecutar según prioridades
+
+        Se toma el primer pendiente de cada sitio web en una sola pasada y
+        después los ``max_count`` primeros de esos, sin ordenar la lista
+        completa de pendientes. El resultado es el mismo que recorrer
+        ``get_pending_scraps()`` saltando los sitios ya elegidos.
+        """
+        # Sitio web -> (clave de orden, posición, scrap) de su primer pendiente
+        best_by_website: Dict[str, Tuple] = {}
+        try:
+            for position, scrap in enumerate(self._iter_pending()):
+                key = _PENDING_SORT_KEY(scrap)
+                best = best_by_website.get(scrap['website'])
+                if best is None or key < best[0]:
+                    best_by_website[scrap['website']] = (key, position, scrap)
+        except Exception as e:
+            self.logger.error("Error obteniendo scraps pendientes: %s", e)
+            return []
+
+        return [
+            scrap for _, _, scrap in heapq.nsmallest(
+                max_count, best_by_website.values(), key=itemgetter(0, 1)
+            )
+        ]
+
     def get_scraps_by_website(self, website: str) -> List[Dict]:
         """Obtener todos los scraps de un sitio web específico"""
         try:
-            scraps = [s for s in self.urls_registry if s['website'].lower() == website.lower()]
+            scraps = list(self._scraps_for(website))
             scraps.sort(key=lambda x: int(x.get('prioridad', 10)))
             return scraps
         except Exception as e:
-            self.logger.error(f"Error obteniendo scraps por website: {e}")
+            self.logger.error("Error obteniendo scraps por website: %s", e)
             return []
     
     def update_scrap_execution(self, scrap_id: str, status: str, records_extracted: int = 0,
                              execution_time_minutes: float = 0, observations: str = '') -> bool:
         """Actualizar el estado de ejecución de un scrap"""
         try:
-            scrap = next((s for s in self.urls_registry if s['id'] == scrap_id), None)
+            scrap = self._by_id.get(scrap_id)
             if not scrap:
-                self.logger.warning(f"Scrap {scrap_id} no encontrado para actualizar")
-                return False
-
-            csv_path = self.csv_urls_dir / scrap['csv_file']
-            self.ensure_csv_progress_columns(csv_path)
-
-            with open(csv_path, 'r', encoding='utf-8-sig') as f:
-                reader = csv.DictReader(row for row in f if not row.lstrip().startswith('#'))
-                fieldnames = reader.fieldnames or []
-                rows = list(reader)
-
-            row_index = scrap['csv_row'] - 1
-            if row_index >= len(rows):
-                self.logger.warning(f"Índice de fila inválido para {scrap_id}")
+                self.logger.warning("Scrap %s no encontrado para actualizar", scrap_id)
                 return False
 
-            row = rows[row_index]
             now = datetime.now()
             next_run = now + timedelta(days=scrap.get('intervalo_dias', 30))
 
-            row['Status'] = status
-            row['LastRun'] = now.isoformat()
-            row['NextRun'] = next_run.isoformat()
-            row['ScrapOfMonth'] = now.strftime('%Y-%m')
-            row['Records'] = str(records_extracted)
-            rows[row_index] = row
-
-            with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(rows)
-
-            scrap.update({
+            update = {
+                'id': scrap_id,
+                'csv_file': scrap['csv_file'],
+                'csv_row': scrap['csv_row'],
                 'status': status,
-                'last_run': row['LastRun'],
-                'next_run': row['NextRun'],
-                'scrap_of_month': row['ScrapOfMonth'],
-                'records': row['Records']
-            })
-
-            self.logger.info(f"Scrap {scrap_id} actualizado: {status}")
+                'last_run': now.isoformat(),
+                'next_run': next_run.isoformat(),
+                'scrap_of_month': now.strftime('%Y-%m'),
+                'records': str(records_extracted)
+            }
+
+            with self._lock:
+                # Registrar solo la fila modificada; los CSV se reescriben al compactar
+                self._journal_buffer.append(_json_dumps(update) + b'\n')
+                self._dirty = True
+
+                # Mantener los contadores de get_statistics sin recorrer el registry
+                stats = self.__dict__.get('_stats')
+                if stats is not None:
+                    self._count_stats(stats, scrap, -1)
+                scrap.update({key: update[key] for key in self.progress_fields})
+                scrap['_next_run_dt'] = next_run
+                scrap['_last_run_dt'] = now
+                scrap['_records'] = _parse_records(update['records'])
+                if stats is not None:
+                    self._count_stats(stats, scrap, 1)
+
+            # Fuera de un ``batch`` de este hilo se escribe al momento
+            if not getattr(self._batch_state, 'depth', 0):
+                self.flush()
+
+            self.logger.info("Scrap %s actualizado: %s", scrap_id, status)
             return True
 
         except Exception as e:
-            self.logger.error(f"Error actualizando scrap {scrap_id}: {e}")
+            self.logger.error("Error actualizando scrap %s: %s", scrap_id, e)
             return False
     
     def get_next_scheduled_scrap(self, website: str = None) -> Optional[Dict]:
         """Obtener el próximo scrap programado"""
-        pending_scraps = self.get_pending_scraps(website)
+        pending_scraps = self.get_pending_scraps(website, limit=1)
 
         if pending_scraps:
             return pending_scraps[0]
@@ -398,32 +1032,27 @@ class EnhancedScrapsRegistry:
         max_records = -1
 
         try:
-            for scrap in self.urls_registry:
-                if website and scrap["website"].lower() != website.lower():
-                    continue
+            for scrap in self._scraps_for(website):
                 if city and scrap["ciudad"].lower() != city.lower():
                     continue
 
                 if scrap.get("scrap_of_month") != current_month:
                     continue
 
-                try:
-                    records = int(scrap.get("records", 0))
-                except (TypeError, ValueError):
-                    records = 0
-
+                records = scrap['_records']
                 if records > max_records:
                     max_records = records
                     top_scrap = scrap
 
         except Exception as e:
-            self.logger.error(f"Error obteniendo scrap del mes: {e}")
+            self.logger.error("Error obteniendo scrap del mes: %s", e)
             return None
 
         return top_scrap
     
-    def get_statistics(self) -> Dict:
-        """Obtener estadísticas del registry"""
+    @cached_property
+    def _stats(self) -> Dict:
+        """Contadores de get_statistics, calculados una vez y mantenidos al actualizar"""
         stats = {
             'total_scraps': 0,
             'scraps_activos': 0,
@@ -431,63 +1060,106 @@ class EnhancedScrapsRegistry:
             'total_ejecuciones': 0,
             'ejecuciones_exitosas': 0,
             'ejecuciones_fallidas': 0,
-            'promedio_registros': 0
+            'promedio_registros': 0,
+            'total_registros': 0
         }
+        for scrap in self.urls_registry:
+            self._count_stats(stats, scrap, 1)
+        return stats
+
+    @staticmethod
+    def _count_stats(stats: Dict, scrap: Dict, sign: int) -> None:
+        """Sumar (``sign=1``) o restar (``sign=-1``) un scrap de los contadores"""
+        website = scrap['website']
+        site = stats['por_website'].get(website)
+        if site is None:
+            site = stats['por_website'][website] = {
+                'total': 0,
+                'activos': 0,
+                'ejecuciones': 0,
+                'exitosos': 0,
+                'fallidos': 0
+            }
+
+        stats['total_scraps'] += sign
+        site['total'] += sign
+
+        if scrap.get('activo', True):
+            stats['scraps_activos'] += sign
+            site['activos'] += sign
+
+        if scrap.get('last_run'):
+            stats['total_ejecuciones'] += sign
+            site['ejecuciones'] += sign
+
+            if scrap.get('status', '').lower() == 'exitoso':
+                stats['ejecuciones_exitosas'] += sign
+                site['exitosos'] += sign
+            else:
+                stats['ejecuciones_fallidas'] += sign
+                site['fallidos'] += sign
+
+            stats['total_registros'] += sign * scrap['_records']
 
+    def get_statistics(self) -> Dict:
+        """Obtener estadísticas del registry"""
         try:
-            total_registros = 0
-
-            for scrap in self.urls_registry:
-                stats['total_scraps'] += 1
-
-                if scrap.get('activo', True):
-                    stats['scraps_activos'] += 1
-
-                website = scrap['website']
-                if website not in stats['por_website']:
-                    stats['por_website'][website] = {
-                        'total': 0,
-                        'activos': 0,
-                        'ejecuciones': 0,
-                        'exitosos': 0,
-                        'fallidos': 0
-                    }
-
-                stats['por_website'][website]['total'] += 1
-
-                if scrap.get('activo', True):
-                    stats['por_website'][website]['activos'] += 1
-
-                if scrap.get('last_run'):
-                    stats['total_ejecuciones'] += 1
-                    stats['por_website'][website]['ejecuciones'] += 1
-
-                    if scrap.get('status', '').lower() == 'exitoso':
-                        stats['ejecuciones_exitosas'] += 1
-                        stats['por_website'][website]['exitosos'] += 1
-                    else:
-                        stats['ejecuciones_fallidas'] += 1
-                        stats['por_website'][website]['fallidos'] += 1
-
-                    try:
-                        total_registros += int(scrap.get('records', 0))
-                    except ValueError:
-                        pass
-
-            if stats['total_ejecuciones'] > 0:
-                stats['promedio_registros'] = round(
-                    total_registros / stats['total_ejecuciones'], 2
-                )
-
-            return stats
-
+            stats = copy.deepcopy(self._stats)
         except Exception as e:
-            self.logger.error(f"Error obteniendo estadísticas: {e}")
-            return stats
+            self.logger.error("Error obteniendo estadísticas: %s", e)
+            return {
+                'total_scraps': 0,
+                'scraps_activos': 0,
+                'por_website': {},
+                'total_ejecuciones': 0,
+                'ejecuciones_exitosas': 0,
+                'ejecuciones_fallidas': 0,
+                'promedio_registros': 0
+            }
+
+        total_registros = stats.pop('total_registros')
+        if stats['total_ejecuciones'] > 0:
+            stats['promedio_registros'] = round(
+                total_registros / stats['total_ejecuciones'], 2
+            )
+        return stats
 
     def get_registry_stats(self) -> Dict:
-        """Alias de get_statistics para compatibilidad"""
-        return self.get_statistics()
+        """Estadísticas de get_statistics más los contadores por estado
+
+        Añade las claves que usa el orquestador (``completed``, ``failed``,
+        ``pending``, ``running``, ``paused`` y ``total_properties_scraped``),
+        calculadas en una sola pasada por el registry. Las URLs sin estado
+        cuentan como pendientes.
+        """
+        stats = self.get_statistics()
+        status_counts: Counter = Counter()
+        total_properties = 0
+        for scrap in self.urls_registry:
+            status_counts[scrap['status'] or 'pending'] += 1
+            total_properties += scrap['_records']
+
+        for status in ('completed', 'failed', 'pending', 'running', 'paused'):
+            stats[status] = status_counts[status]
+        stats['total_properties_scraped'] = total_properties
+        return stats
+
+    @staticmethod
+    def _count_progress(progress: Dict[str, int], scrap: Dict, now: datetime) -> None:
+        """Sumar una entrada del registro al resumen de progreso"""
+        progress['total'] += 1
+        status = scrap.get('status', '')
+        next_run_dt = scrap.get('_next_run_dt')
+
+        if scrap.get('last_run'):
+            progress['completed'] += 1
+            if status.lower() == 'exitoso':
+                progress['success'] += 1
+            elif status:
+                progress['failed'] += 1
+
+        if next_run_dt is None or next_run_dt <= now:
+            progress['pending'] += 1
 
     def get_csv_progress(self, csv_filename: str) -> Dict[str, int]:
         """Obtener resumen de progreso de un archivo CSV específico"""
@@ -499,40 +1171,20 @@ class EnhancedScrapsRegistry:
             'failed': 0
         }
 
-        csv_path = self.csv_urls_dir / csv_filename
+        csv_path = self._csv_path(csv_filename)
         if not csv_path.exists():
             return progress
 
-        self.ensure_csv_progress_columns(csv_path)
         now = datetime.now()
 
         try:
-            with open(csv_path, 'r', encoding='utf-8-sig') as f:
-                reader = csv.DictReader(row for row in f if not row.lstrip().startswith('#'))
-                for row in reader:
-                    progress['total'] += 1
-                    status = row.get('Status', '')
-                    last_run = row.get('LastRun', '')
-                    next_run = row.get('NextRun', '')
-
-                    if last_run:
-                        progress['completed'] += 1
-                        if status.lower() == 'exitoso':
-                            progress['success'] += 1
-                        elif status:
-                            progress['failed'] += 1
-
-                    if not next_run:
-                        progress['pending'] += 1
-                    else:
-                        try:
-                            if datetime.fromisoformat(next_run) <= now:
-                                progress['pending'] += 1
-                        except ValueError:
-                            progress['pending'] += 1
+            # Las filas ya están cargadas en memoria, no es necesario releer el CSV
+            for scrap in self.urls_registry:
+                if scrap.get('csv_file') == csv_filename:
+                    self._count_progress(progress, scrap, now)
 
         except Exception as e:
-            self.logger.error(f"Error obteniendo progreso de {csv_filename}: {e}")
+            self.logger.error("Error obteniendo progreso de %s: %s", csv_filename, e)
 
         return progress
 
@@ -540,11 +1192,26 @@ class EnhancedScrapsRegistry:
         """Obtener progreso de todos los archivos CSV"""
         progress: Dict[str, Dict[str, int]] = {}
 
-        if not self.csv_urls_dir.exists():
+        try:
+            csv_files = self._list_csvs()
+        except FileNotFoundError:
             return progress
 
-        for csv_file in self.csv_urls_dir.glob('*.csv'):
-            progress[csv_file.name] = self.get_csv_progress(csv_file.name)
+        for csv_file in csv_files:
+            progress[csv_file.name] = {
+                'total': 0,
+                'completed': 0,
+                'pending': 0,
+                'success': 0,
+                'failed': 0
+            }
+
+        # Una sola pasada sobre el registro en memoria para todos los archivos
+        now = datetime.now()
+        for scrap in self.urls_registry:
+            file_progress = progress.get(scrap.get('csv_file'))
+            if file_progress is not None:
+                self._count_progress(file_progress, scrap, now)
 
         return progress
     
@@ -605,9 +1272,30 @@ class EnhancedScrapsRegistry:
             return str(report_file)
             
         except Exception as e:
-            self.logger.error(f"Error exportando reporte: {e}")
+            self.logger.error("Error exportando reporte: %s", e)
             return ""
 
+
+# Registro compartido por los componentes de un mismo proceso (ver ``get_registry``)
+_REGISTRY: Optional[EnhancedScrapsRegistry] = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_registry() -> EnhancedScrapsRegistry:
+    """Instancia de ``EnhancedScrapsRegistry`` compartida dentro del proceso
+
+    Evita que el orquestador, el sistema de recuperación y los monitores
+    vuelvan a cargar cada uno todos los CSV de URLs y lleven diarios de
+    actualizaciones separados.
+    """
+    global _REGISTRY
+    if _REGISTRY is None:
+        with _REGISTRY_LOCK:
+            if _REGISTRY is None:
+                _REGISTRY = EnhancedScrapsRegistry()
+    return _REGISTRY
+
+
 def main():
     """Función de prueba"""
     registry = EnhancedScrapsRegistry()
@@ -4,16 +4,29 @@ Google Drive Backup Manager - PropertyScraper Dell710
 Sistema de respaldo automático usando rclone hacia Google Drive
 """
 
+import atexit
+import base64
 import os
+import posixpath
 import sys
 import json
 import time
 import logging
+import queue
+import secrets
+import signal
+import socket
 import subprocess
+import tempfile
 import threading
-from datetime import datetime, timedelta
+import urllib.error
+import urllib.request
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 import yaml
 
 class GoogleDriveBackupManager:
@@ -21,6 +34,15 @@ class GoogleDriveBackupManager:
     Gestor de respaldos automáticos hacia Google Drive
     Utiliza rclone para sincronizar archivos CSV sin interrumpir scrapers
     """
+
+    # Opciones de rclone para copiar muchos CSV pequeños en paralelo
+    RCLONE_COPY_FLAGS = [
+        '--transfers', '16',
+        '--checkers', '32',
+        '--fast-list',
+        '--drive-chunk-size', '64M',
+        '--drive-pacer-min-sleep', '10ms',
+    ]
     
     def __init__(self, config_path=None):
         self.setup_logging()
@@ -35,26 +57,71 @@ class GoogleDriveBackupManager:
         # Configuración de rclone
         self.rclone_remote = 'gdrive'
         self.rclone_base_path = 'PropertyScraper-Dell710-Data'
+        # Último resultado de check_rclone_config: (instante monotónico, resultado)
+        self._rclone_ok_cache: Optional[Tuple[float, bool]] = None
+        # Último recorrido de data_dir: (instante monotónico, archivos, bytes)
+        self._enum_cache: Optional[Tuple[float, List[Tuple[Path, str]], int]] = None
         
         # Control de respaldos
         self.backup_queue = []
         self.backup_thread = None
         self.backup_running = False
         self.backup_interval = 300  # 5 minutos
+        # Copias simultáneas cuando se respalda archivo por archivo
+        backup_config = (self.config or {}).get('data_management', {}).get('backup', {})
+        self.backup_workers = backup_config.get('workers', 8)
+        # Procesos ``rclone copy`` de directorio simultáneos como máximo
+        self._rclone_slots = threading.BoundedSemaphore(self.backup_workers)
+
+        # Daemon ``rclone rcd`` para las copias archivo por archivo
+        self.use_rcd = backup_config.get('use_rcd', True)
+        self._rcd_proc: Optional[subprocess.Popen] = None
+        # Dirección y cabecera de autenticación del daemon iniciado
+        self._rcd_addr: Optional[str] = None
+        self._rcd_auth: Optional[str] = None
+        self._rcd_available: Optional[bool] = None
+        self._rcd_lock = threading.Lock()
+
+        # Carpetas de Drive ya creadas con rclone mkdir (se olvidan cada día,
+        # por si alguien las borra a mano)
+        self._gdrive_dirs_created: set = set()
+        self._gdrive_dirs_day = datetime.now().date()
         
-        # Historial de respaldos
-        self.backup_history = []
-        self.history_file = self.project_root / 'logs' / 'backup_history.json'
+        # Historial de respaldos: diario JSONL en disco y últimos 100 en memoria
+        self.history_file = self.project_root / 'logs' / 'backup_history.jsonl'
+        self.backup_history = self.load_backup_history()
+
+        # Tamaño y mtime de cada CSV ya subido, para no volver a copiarlo
+        self.upload_cache_file = self.project_root / 'logs' / 'upload_cache.json'
+        self._upload_cache: Dict[str, Tuple[int, int]] = self._load_upload_cache()
+
+        # Inicio (epoch) del último respaldo sin fallos; el incremental copia
+        # todo lo modificado desde entonces, no solo el último intervalo
+        self.last_sync_file = self.project_root / 'logs' / 'last_sync.json'
+        self._last_sync: Optional[float] = self._load_last_sync()
         
         self.logger.info("☁️  Google Drive Backup Manager inicializado")
         self.logger.info(f"   Directorio de datos: {self.data_dir}")
         self.logger.info(f"   Remote rclone: {self.rclone_remote}")
         self.logger.info(f"   Ruta base Drive: {self.rclone_base_path}")
     
+    # Nombre del handler de archivo, para añadirlo una sola vez por proceso
+    LOG_HANDLER_NAME = 'gdrive_backup'
+
     def setup_logging(self):
-        """Configurar logging específico para backup"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        
+        """Configurar logging específico para backup
+
+        El archivo de log (uno por día, rotado por tamaño) se añade una sola vez
+        al logger del módulo, de modo que crear más instancias no abre nuevos
+        archivos ni duplica handlers. Las escrituras a disco las hace un
+        ``QueueListener`` en su propio hilo, así el hilo de respaldo no se
+        bloquea esperando al disco. La consola se configura solo si nadie
+        configuró antes el logging del proceso.
+        """
+        self.logger = logging.getLogger(__name__)
+        if any(h.get_name() == self.LOG_HANDLER_NAME for h in self.logger.handlers):
+            return
+
         # Determinar directorio de logs
         if os.path.exists('/home/scraper/PropertyScraper-Dell710/logs'):
             log_dir = Path('/home/scraper/PropertyScraper-Dell710/logs')
@@ -62,19 +129,34 @@ class GoogleDriveBackupManager:
             log_dir = Path(__file__).parent.parent / 'logs'
         
         log_dir.mkdir(exist_ok=True)
-        log_file = log_dir / f"gdrive_backup_{timestamp}.log"
-        
+        log_file = log_dir / f"gdrive_backup_{datetime.now():%Y%m%d}.log"
+
+        log_format = '%(asctime)s | %(levelname)8s | BACKUP | %(message)s'
+        date_format = '%Y-%m-%d %H:%M:%S'
+
+        file_handler = RotatingFileHandler(
+            log_file, maxBytes=10_000_000, backupCount=5, encoding='utf-8'
+        )
+        file_handler.setFormatter(logging.Formatter(log_format, datefmt=date_format))
+
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, file_handler)
+        listener.start()
+        # Vaciar la cola y cerrar el archivo al salir
+        atexit.register(listener.stop)
+
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.set_name(self.LOG_HANDLER_NAME)
+        self.logger.addHandler(queue_handler)
+        self.logger.setLevel(logging.INFO)
+
+        # Sin efecto si el orquestador ya configuró el logging raíz
         logging.basicConfig(
             level=logging.INFO,
-            format='%(asctime)s | %(levelname)8s | BACKUP | %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S',
-            handlers=[
-                logging.FileHandler(log_file, encoding='utf-8'),
-                logging.StreamHandler(sys.stdout)
-            ]
+            format=log_format,
+            datefmt=date_format,
+            handlers=[logging.StreamHandler(sys.stdout)]
         )
-        
-        self.logger = logging.getLogger(__name__)
     
     def load_config(self, config_path):
         """Cargar configuración del sistema"""
@@ -91,8 +173,30 @@ class GoogleDriveBackupManager:
             self.logger.warning(f"⚠️  Error cargando configuración: {e}")
             return {}
     
+    # Segundos durante los que se reutiliza la comprobación de rclone
+    RCLONE_CHECK_TTL = 60
+
     def check_rclone_config(self) -> bool:
-        """Verificar configuración de rclone"""
+        """Verificar configuración de rclone
+
+        El resultado se reutiliza durante ``RCLONE_CHECK_TTL`` segundos para no
+        lanzar ``rclone listremotes`` en cada consulta de estado o respaldo.
+        """
+        now = time.monotonic()
+        cached = self._rclone_ok_cache
+        if cached is not None and now - cached[0] < self.RCLONE_CHECK_TTL:
+            return cached[1]
+
+        rclone_ok = self._probe_rclone()
+        self._rclone_ok_cache = (now, rclone_ok)
+        return rclone_ok
+
+    def invalidate_rclone_cache(self):
+        """Forzar una nueva comprobación de rclone en la próxima consulta"""
+        self._rclone_ok_cache = None
+
+    def _probe_rclone(self) -> bool:
+        """Comprobar con ``rclone listremotes`` que el remote está configurado"""
         try:
             result = subprocess.run(['rclone', 'listremotes'], 
                                   capture_output=True, text=True, timeout=30)
@@ -113,20 +217,38 @@ class GoogleDriveBackupManager:
             self.logger.error(f"❌ Error verificando rclone: {e}")
             return False
     
+    def _scandir_csv(self, root: Path) -> Iterator[os.DirEntry]:
+        """Recorrer ``root`` con ``os.scandir`` y devolver los CSV encontrados
+
+        Cada ``DirEntry`` conserva el tipo y, tras la primera llamada a
+        ``stat()``, sus metadatos, de modo que no se repiten llamadas al
+        sistema. No se sigue ningún enlace simbólico a directorios.
+        """
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = os.scandir(directory)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith('.csv') and entry.is_file():
+                        yield entry
+
+    def _backup_target(self, entry: os.DirEntry) -> Tuple[Path, str]:
+        """Ruta local y ruta de destino en Google Drive de un CSV"""
+        # Las rutas de Drive usan siempre "/", también en Windows
+        relative_path = Path(os.path.relpath(entry.path, self.data_dir)).as_posix()
+        return Path(entry.path), posixpath.join(self.rclone_base_path, relative_path)
+
     def get_csv_files_to_backup(self) -> List[Tuple[Path, str]]:
         """Obtener lista de archivos CSV para respaldar"""
-        csv_files = []
-        
         try:
             # Buscar todos los archivos CSV en la estructura de datos
-            for csv_file in self.data_dir.rglob('*.csv'):
-                # Calcular ruta relativa desde data_dir
-                relative_path = csv_file.relative_to(self.data_dir)
-                
-                # Construir ruta de destino en Google Drive
-                gdrive_path = f"{self.rclone_base_path}/{relative_path}"
-                
-                csv_files.append((csv_file, gdrive_path))
+            csv_files = [self._backup_target(entry) for entry in self._scandir_csv(self.data_dir)]
             
             self.logger.debug(f"📄 Encontrados {len(csv_files)} archivos CSV para respaldo")
             return csv_files
@@ -134,20 +256,280 @@ class GoogleDriveBackupManager:
         except Exception as e:
             self.logger.error(f"❌ Error buscando archivos CSV: {e}")
             return []
+
+    # Segundos durante los que se reutiliza el último recorrido de data_dir
+    ENUM_CACHE_TTL = 30
+
+    def _enumerate(self) -> Tuple[List[Tuple[Path, str]], int]:
+        """CSV a respaldar y su tamaño total en bytes
+
+        Un solo recorrido sirve a ``get_backup_status`` y ``run_backup_now``:
+        el resultado se reutiliza durante ``ENUM_CACHE_TTL`` segundos, así
+        consultar el estado con frecuencia no vuelve a recorrer el árbol.
+        """
+        now = time.monotonic()
+        cached = self._enum_cache
+        if cached is not None and now - cached[0] < self.ENUM_CACHE_TTL:
+            return cached[1], cached[2]
+
+        csv_files = []
+        total_bytes = 0
+        try:
+            for entry in self._scandir_csv(self.data_dir):
+                csv_files.append(self._backup_target(entry))
+                try:
+                    total_bytes += entry.stat().st_size
+                except OSError:
+                    pass
+        except Exception as e:
+            self.logger.error(f"❌ Error buscando archivos CSV: {e}")
+            return [], 0
+
+        self._enum_cache = (now, csv_files, total_bytes)
+        return csv_files, total_bytes
     
+    # Líneas finales de stderr de rclone que se conservan para los errores
+    RCLONE_STDERR_TAIL = 256
+
+    def _run_rclone(self, cmd: List[str], timeout: float,
+                    on_line: Optional[Callable[[str], None]] = None) -> Tuple[int, str]:
+        """Ejecutar rclone leyendo su stderr línea a línea
+
+        Cada línea se pasa a ``on_line`` (o al log de depuración) según llega,
+        y solo se guardan las últimas ``RCLONE_STDERR_TAIL`` para informar de
+        errores, de modo que la memoria no crece con transferencias largas.
+        Devuelve el código de salida y ese final de stderr. Si se supera
+        ``timeout`` el proceso se termina y se lanza ``TimeoutExpired``.
+        """
+        # rclone en su propio grupo de procesos para poder terminarlo entero
+        proc = subprocess.Popen(
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+            text=True, bufsize=1, start_new_session=(os.name == 'posix')
+        )
+        # El temporizador termina rclone aunque deje de escribir en stderr
+        timer = threading.Timer(timeout, self._kill_process, args=(proc,))
+        timer.start()
+        tail = deque(maxlen=self.RCLONE_STDERR_TAIL)
+        try:
+            with proc.stderr:
+                for line in proc.stderr:
+                    tail.append(line)
+                    if on_line is not None:
+                        on_line(line)
+                    else:
+                        self.logger.debug(line.rstrip())
+            returncode = proc.wait()
+        finally:
+            timed_out = not timer.is_alive()
+            timer.cancel()
+            if proc.poll() is None:
+                self._kill_process(proc)
+                proc.wait()
+
+        if timed_out:
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        return returncode, ''.join(tail)
+
+    @staticmethod
+    def _kill_process(proc: subprocess.Popen):
+        """Terminar un proceso lanzado por ``_run_rclone`` y su grupo"""
+        try:
+            if os.name == 'posix':
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:
+                proc.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def _load_upload_cache(self) -> Dict[str, Tuple[int, int]]:
+        """Cargar la caché de archivos ya subidos (ruta -> (tamaño, mtime_ns))"""
+        try:
+            with open(self.upload_cache_file, 'r', encoding='utf-8') as f:
+                return {path: tuple(signature) for path, signature in json.load(f).items()}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.logger.warning(f"⚠️  Error cargando caché de subidas: {e}")
+            return {}
+
+    def _save_upload_cache(self):
+        """Guardar la caché de archivos ya subidos"""
+        try:
+            self.upload_cache_file.parent.mkdir(exist_ok=True)
+            tmp_file = self.upload_cache_file.with_suffix('.json.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self._upload_cache, f, ensure_ascii=False, separators=self.JSON_SEPARATORS)
+            os.replace(tmp_file, self.upload_cache_file)
+        except Exception as e:
+            self.logger.warning(f"⚠️  Error guardando caché de subidas: {e}")
+
+    def _load_last_sync(self) -> Optional[float]:
+        """Cargar el inicio del último respaldo completado sin fallos"""
+        try:
+            with open(self.last_sync_file, 'r', encoding='utf-8') as f:
+                return float(json.load(f)['last_success'])
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.warning(f"⚠️  Error cargando último respaldo correcto: {e}")
+            return None
+
+    def _save_last_sync(self, started: float):
+        """Guardar el inicio de un respaldo completado sin fallos"""
+        self._last_sync = started
+        try:
+            self.last_sync_file.parent.mkdir(exist_ok=True)
+            tmp_file = self.last_sync_file.with_suffix('.json.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'last_success': started}, f, separators=self.JSON_SEPARATORS)
+            os.replace(tmp_file, self.last_sync_file)
+        except Exception as e:
+            self.logger.warning(f"⚠️  Error guardando último respaldo correcto: {e}")
+
+    @staticmethod
+    def _file_signature(local_file: Path) -> Tuple[int, int]:
+        """Tamaño y mtime (ns) de un archivo, para detectar cambios"""
+        st = local_file.stat()
+        return st.st_size, st.st_mtime_ns
+
+    def _rc_call(self, method: str, payload: Dict, timeout: float = 300) -> Dict:
+        """Llamar a un método del API de control remoto de rclone
+
+        Lanza ``RuntimeError`` si rclone responde con un error y ``OSError``
+        si el daemon no está accesible.
+        """
+        request = urllib.request.Request(
+            f'http://{self._rcd_addr}/{method}',
+            data=json.dumps(payload).encode('utf-8'),
+            headers={'Content-Type': 'application/json', 'Authorization': self._rcd_auth}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                return json.load(response)
+        except urllib.error.HTTPError as e:
+            try:
+                error = json.load(e).get('error', str(e))
+            except ValueError:
+                error = str(e)
+            raise RuntimeError(error) from None
+
+    def _ensure_rcd(self) -> bool:
+        """Arrancar, una sola vez, ``rclone rcd`` y comprobar que responde
+
+        Devuelve ``False`` (y no se vuelve a intentar) si el daemon no está
+        disponible, en cuyo caso las copias usan un proceso rclone cada una.
+        """
+        if not self.use_rcd:
+            return False
+
+        with self._rcd_lock:
+            if self._rcd_available is not None:
+                return self._rcd_available
+
+            # El daemon da acceso al remoto de Drive: se protege con un usuario
+            # y contraseña aleatorios por arranque, pasados por el entorno para
+            # que no aparezcan en la línea de comandos, y escucha en un puerto
+            # libre para no hablar nunca con un daemon ajeno
+            user, password = secrets.token_urlsafe(16), secrets.token_urlsafe(32)
+            env = dict(os.environ, RCLONE_RC_USER=user, RCLONE_RC_PASS=password)
+            try:
+                with socket.socket() as sock:
+                    sock.bind(('127.0.0.1', 0))
+                    self._rcd_addr = f'127.0.0.1:{sock.getsockname()[1]}'
+                self._rcd_auth = 'Basic ' + base64.b64encode(
+                    f'{user}:{password}'.encode('utf-8')).decode('ascii')
+                self._rcd_proc = subprocess.Popen(
+                    ['rclone', 'rcd', '--rc-addr', self._rcd_addr],
+                    env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                    start_new_session=(os.name == 'posix')
+                )
+            except OSError as e:
+                self.logger.warning(f"⚠️  No se pudo iniciar rclone rcd: {e}")
+                self._rcd_available = False
+                return False
+            atexit.register(self._stop_rcd)
+
+            # Esperar a que el daemon responda
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline and self._rcd_proc.poll() is None:
+                try:
+                    self._rc_call('rc/noop', {}, timeout=2)
+                    self._rcd_available = True
+                    self.logger.info(f"🔌 rclone rcd disponible en {self._rcd_addr}")
+                    return True
+                except (OSError, RuntimeError):
+                    time.sleep(0.1)
+
+            self.logger.warning("⚠️  rclone rcd no responde; se usará un proceso por archivo")
+            self._stop_rcd()
+            self._rcd_available = False
+            return False
+
+    def _stop_rcd(self):
+        """Detener el daemon ``rclone rcd`` iniciado por esta instancia"""
+        proc, self._rcd_proc = self._rcd_proc, None
+        self._rcd_available = None
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._kill_process(proc)
+
+    def _ensure_gdrive_dir(self, gdrive_dir: str):
+        """Crear una carpeta de Drive con ``rclone mkdir`` una vez al día"""
+        today = datetime.now().date()
+        if today != self._gdrive_dirs_day:
+            self._gdrive_dirs_created = set()
+            self._gdrive_dirs_day = today
+
+        if gdrive_dir in self._gdrive_dirs_created:
+            return
+
+        mkdir_cmd = ['rclone', 'mkdir', f'{self.rclone_remote}:{gdrive_dir}']
+        result = subprocess.run(mkdir_cmd, capture_output=True, timeout=60)
+        if result.returncode == 0:
+            self._gdrive_dirs_created.add(gdrive_dir)
+
     def backup_file_to_gdrive(self, local_file: Path, gdrive_path: str) -> bool:
-        """Respaldar archivo individual a Google Drive"""
+        """Respaldar archivo individual a Google Drive
+
+        Los archivos que no cambiaron desde su última subida se omiten.
+        """
         try:
             # Verificar que el archivo local existe
             if not local_file.exists():
                 self.logger.warning(f"⚠️  Archivo no existe: {local_file}")
                 return False
+
+            signature = self._file_signature(local_file)
+            if self._upload_cache.get(str(local_file)) == signature:
+                self.logger.debug(f"⏭️  Sin cambios desde la última subida: {local_file.name}")
+                return True
             
+            gdrive_dir = posixpath.dirname(gdrive_path)
+
+            # Con el daemon no se lanza ningún proceso; copyfile crea las carpetas
+            if self._ensure_rcd():
+                try:
+                    self._rc_call('operations/copyfile', {
+                        'srcFs': str(local_file.parent),
+                        'srcRemote': local_file.name,
+                        'dstFs': f'{self.rclone_remote}:{gdrive_dir}',
+                        'dstRemote': local_file.name
+                    })
+                    self._upload_cache[str(local_file)] = signature
+                    self.logger.info(f"✅ Respaldado exitosamente: {local_file.name}")
+                    return True
+                except RuntimeError as e:
+                    self.logger.error(f"❌ Error respaldando {local_file.name}: {e}")
+                    return False
+                except OSError as e:
+                    self.logger.warning(f"⚠️  rclone rcd no accesible ({e}); usando rclone copy")
+                    self._rcd_available = False
+
             # Crear directorio remoto si no existe
-            gdrive_dir = '/'.join(gdrive_path.split('/')[:-1])
-            mkdir_cmd = ['rclone', 'mkdir', f'{self.rclone_remote}:{gdrive_dir}']
-            
-            subprocess.run(mkdir_cmd, capture_output=True, timeout=60)
+            self._ensure_gdrive_dir(gdrive_dir)
             
             # Comando de copia
             copy_cmd = [
@@ -159,13 +541,14 @@ class GoogleDriveBackupManager:
             
             self.logger.debug(f"☁️  Respaldando: {local_file.name} → {gdrive_path}")
             
-            result = subprocess.run(copy_cmd, capture_output=True, text=True, timeout=300)
+            returncode, stderr = self._run_rclone(copy_cmd, timeout=300)
             
-            if result.returncode == 0:
+            if returncode == 0:
+                self._upload_cache[str(local_file)] = signature
                 self.logger.info(f"✅ Respaldado exitosamente: {local_file.name}")
                 return True
             else:
-                self.logger.error(f"❌ Error respaldando {local_file.name}: {result.stderr}")
+                self.logger.error(f"❌ Error respaldando {local_file.name}: {stderr}")
                 return False
                 
         except subprocess.TimeoutExpired:
@@ -175,37 +558,6 @@ class GoogleDriveBackupManager:
             self.logger.error(f"❌ Error respaldando {local_file.name}: {e}")
             return False
     
-    def backup_directory_structure(self) -> bool:
-        """Respaldar estructura completa de directorios"""
-        try:
-            self.logger.info("📁 Creando estructura de directorios en Google Drive...")
-            
-            # Obtener todas las carpetas en data/
-            directories = []
-            for item in self.data_dir.rglob('*'):
-                if item.is_dir():
-                    relative_path = item.relative_to(self.data_dir)
-                    gdrive_path = f"{self.rclone_base_path}/{relative_path}"
-                    directories.append(gdrive_path)
-            
-            # Crear directorios en lotes
-            for directory in directories:
-                mkdir_cmd = ['rclone', 'mkdir', f'{self.rclone_remote}:{directory}']
-                
-                try:
-                    result = subprocess.run(mkdir_cmd, capture_output=True, timeout=30)
-                    if result.returncode == 0:
-                        self.logger.debug(f"📁 Creado: {directory}")
-                except:
-                    pass  # Ignorar errores (directorio ya existe)
-            
-            self.logger.info(f"✅ Estructura de directorios creada: {len(directories)} carpetas")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"❌ Error creando estructura: {e}")
-            return False
-    
     def backup_website_data(self, website: str, operation: str) -> Dict:
         """Respaldar datos específicos de un website y operación usando rclone copy específico"""
         try:
@@ -220,7 +572,7 @@ class GoogleDriveBackupManager:
             
             # Usar comando rclone copy directo según tu especificación
             # rclone copy /home/esdata/(Directorio) /(Nombre del Archivo) gdrive:/(Directorio)/
-            gdrive_dest = f"{self.rclone_base_path}/{website}/{operation}"
+            gdrive_dest = posixpath.join(self.rclone_base_path, website, operation)
             
             # Comando específico para directorio completo
             copy_cmd = [
@@ -235,9 +587,10 @@ class GoogleDriveBackupManager:
             
             self.logger.info(f"🔄 Ejecutando: rclone copy {local_path} {self.rclone_remote}:{gdrive_dest}")
             
-            result = subprocess.run(copy_cmd, capture_output=True, text=True, timeout=600)
+            with self._rclone_slots:
+                returncode, stderr = self._run_rclone(copy_cmd, timeout=600)
             
-            if result.returncode == 0:
+            if returncode == 0:
                 # Contar archivos CSV respaldados
                 csv_files = list(local_path.rglob('*.csv'))
                 
@@ -252,10 +605,10 @@ class GoogleDriveBackupManager:
                     'gdrive_path': gdrive_dest
                 }
             else:
-                self.logger.error(f"❌ Error en rclone copy: {result.stderr}")
+                self.logger.error(f"❌ Error en rclone copy: {stderr}")
                 return {
                     'success': False, 
-                    'error': result.stderr,
+                    'error': stderr,
                     'website': website,
                     'operation': operation
                 }
@@ -267,8 +620,223 @@ class GoogleDriveBackupManager:
             self.logger.error(f"❌ Error respaldando {website}/{operation}: {e}")
             return {'success': False, 'error': str(e)}
 
+    def backup_all_websites(self) -> Dict:
+        """Respaldar cada ``website/operación`` de data_dir con su propio rclone
+
+        Drive limita las operaciones por sesión, así que varios ``rclone copy``
+        sobre subárboles distintos avanzan más que uno solo. Se lanzan hasta
+        ``backup_workers`` a la vez con ``backup_website_data``.
+        """
+        start = time.monotonic()
+        backup_results = {
+            'start_time': datetime.now().isoformat(),
+            'total_files': 0,
+            'successful': 0,
+            'failed': 0,
+            'errors': [],
+            'shards': []
+        }
+
+        shards = []
+        try:
+            with os.scandir(self.data_dir) as websites:
+                for website in websites:
+                    if not website.is_dir(follow_symlinks=False):
+                        continue
+                    with os.scandir(website.path) as operations:
+                        shards.extend(
+                            (website.name, operation.name) for operation in operations
+                            if operation.is_dir(follow_symlinks=False)
+                        )
+        except OSError as e:
+            self.logger.error(f"❌ Error buscando directorios de datos: {e}")
+            backup_results['errors'].append(str(e))
+            return backup_results
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.backup_workers, len(shards)))) as executor:
+            futures = {
+                executor.submit(self.backup_website_data, website, operation): (website, operation)
+                for website, operation in shards
+            }
+            for future in as_completed(futures):
+                website, operation = futures[future]
+                result = future.result()
+                backup_results['shards'].append(result)
+                if result['success']:
+                    backup_results['successful'] += result['files_backed_up']
+                    backup_results['total_files'] += result['files_backed_up']
+                else:
+                    backup_results['failed'] += 1
+                    backup_results['errors'].append(f"Failed: {website}/{operation}: {result['error']}")
+
+        backup_results['end_time'] = datetime.now().isoformat()
+        backup_results['duration_seconds'] = time.monotonic() - start
+        backup_results['success'] = backup_results['failed'] == 0
+        self.logger.info(
+            f"📊 Respaldo por directorios: {len(shards)} directorios, "
+            f"{backup_results['failed']} con errores, {backup_results['duration_seconds']:.1f}s"
+        )
+        return backup_results
+
+    def _batched_rclone_copy(self, csv_files: List[Tuple[Path, str]]) -> Optional[Dict[str, str]]:
+        """Copiar varios archivos con una sola invocación de ``rclone copy``
+
+        Las rutas relativas a ``data_dir`` se pasan con ``--files-from`` y
+        rclone crea las carpetas remotas que falten. Devuelve los archivos que
+        fallaron (ruta relativa -> error) según el log JSON de rclone, o
+        ``None`` si rclone falló sin indicar ningún archivo concreto.
+        """
+        relative_paths = [
+            local_file.relative_to(self.data_dir).as_posix() for local_file, _ in csv_files
+        ]
+
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.txt', delete=False) as f:
+            f.write('\n'.join(relative_paths) + '\n')
+            files_from = f.name
+
+        # Cada error de un archivo es una línea JSON con la clave "object"
+        failures = {}
+
+        def collect_failure(line: str):
+            entry = self._parse_json_log(line)
+            if entry and entry.get('level') == 'error' and entry.get('object'):
+                failures[entry['object']] = entry.get('msg', '')
+
+        try:
+            copy_cmd = [
+                'rclone', 'copy',
+                str(self.data_dir),
+                f'{self.rclone_remote}:{self.rclone_base_path}',
+                '--files-from', files_from,
+                *self.RCLONE_COPY_FLAGS,
+                '--use-json-log'
+            ]
+            returncode, stderr = self._run_rclone(
+                copy_cmd, timeout=600 + 10 * len(relative_paths), on_line=collect_failure
+            )
+        finally:
+            os.remove(files_from)
+
+        if returncode != 0 and not failures:
+            error = stderr.strip() or f"rclone terminó con código {returncode}"
+            self.logger.error(f"❌ Error en rclone copy del lote: {error}")
+            return None
+
+        return failures
+
+    @staticmethod
+    def _parse_json_log(line: str) -> Optional[Dict]:
+        """Interpretar una línea de ``--use-json-log`` (``None`` si no es JSON)"""
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            return None
+        return entry if isinstance(entry, dict) else None
+
+    def _per_file_copy(self, csv_files: List[Tuple[Path, str]]) -> Dict[str, str]:
+        """Copiar los archivos uno a uno con ``backup_workers`` copias simultáneas"""
+        failures = {}
+        with ThreadPoolExecutor(max_workers=self.backup_workers) as executor:
+            futures = {
+                executor.submit(self.backup_file_to_gdrive, local_file, gdrive_path): local_file
+                for local_file, gdrive_path in csv_files
+            }
+            for future in as_completed(futures):
+                local_file = futures[future]
+                relative_path = local_file.relative_to(self.data_dir).as_posix()
+                try:
+                    if not future.result():
+                        failures[relative_path] = 'rclone copy failed'
+                except Exception as e:
+                    failures[relative_path] = str(e)
+        return failures
+
+    # Margen del filtro ``--max-age`` sobre el último respaldo correcto
+    SYNC_MARGIN_SECONDS = 300
+
+    def _incremental_sync(self) -> Dict:
+        """Copiar a Google Drive los CSV modificados desde el último respaldo correcto
+
+        El filtro por antigüedad (``--max-age``, con 5 minutos de margen) lo
+        aplica rclone durante su propio recorrido, sin enumerar ni consultar
+        cada archivo desde Python. La ventana empieza en el último respaldo
+        sin fallos, así que los archivos de una pasada fallida o perdida se
+        vuelven a intentar; si no se conoce, se copia todo. El resumen se
+        obtiene de las estadísticas finales del log JSON de rclone.
+        """
+        sync_result = {
+            'incremental': True,
+            'total_files': 0,
+            'successful': 0,
+            'failed': 0,
+            'errors': [],
+            'start_time': datetime.now().isoformat()
+        }
+
+        # Reloj de pared: --max-age se compara con el mtime de los archivos
+        started = time.time()
+        age_filter = []
+        if self._last_sync is not None:
+            max_age = max(0, int(started - self._last_sync)) + self.SYNC_MARGIN_SECONDS
+            age_filter = ['--max-age', f'{max_age}s']
+
+        copy_cmd = [
+            'rclone', 'copy',
+            str(self.data_dir),
+            f'{self.rclone_remote}:{self.rclone_base_path}',
+            *age_filter,
+            '--include', '*.csv',
+            *self.RCLONE_COPY_FLAGS,
+            '--no-traverse',
+            '--use-json-log',
+            '--stats-log-level', 'NOTICE'
+        ]
+
+        stats = {}
+
+        def collect_entry(line: str):
+            nonlocal stats
+            entry = self._parse_json_log(line)
+            if not entry:
+                return
+            if 'stats' in entry:
+                stats = entry['stats']
+            elif entry.get('level') == 'error' and entry.get('object'):
+                sync_result['errors'].append(f"Failed: {entry['object']}: {entry.get('msg', '')}")
+
+        try:
+            returncode, stderr = self._run_rclone(
+                copy_cmd, timeout=max(600, self.backup_interval * 2), on_line=collect_entry
+            )
+        except subprocess.TimeoutExpired:
+            self.logger.error("⏱️  Timeout en respaldo incremental")
+            sync_result['errors'].append('Backup timeout')
+            return sync_result
+
+        sync_result['successful'] = stats.get('transfers', 0)
+        sync_result['failed'] = max(stats.get('errors', 0), len(sync_result['errors']))
+        if returncode != 0 and not sync_result['failed']:
+            sync_result['failed'] = 1
+            sync_result['errors'].append(stderr.strip() or f"rclone terminó con código {returncode}")
+        sync_result['total_files'] = sync_result['successful'] + sync_result['failed']
+        sync_result['bytes'] = stats.get('bytes', 0)
+        sync_result['end_time'] = datetime.now().isoformat()
+        sync_result['duration_seconds'] = stats.get('elapsedTime', 0)
+
+        if returncode == 0 and not sync_result['failed']:
+            self._save_last_sync(started)
+
+        if sync_result['total_files']:
+            self.logger.info(
+                f"☁️  Respaldo incremental: {sync_result['successful']} archivos copiados, "
+                f"{sync_result['failed']} fallidos"
+            )
+        return sync_result
+
     def perform_backup_batch(self, csv_files: List[Tuple[Path, str]]) -> Dict:
         """Realizar respaldo en lote de archivos CSV"""
+        # Reloj monotónico para la duración; las fechas ISO son solo informativas
+        start = time.monotonic()
         backup_results = {
             'total_files': len(csv_files),
             'successful': 0,
@@ -279,40 +847,64 @@ class GoogleDriveBackupManager:
         
         try:
             self.logger.info(f"☁️  Iniciando respaldo de {len(csv_files)} archivos CSV...")
-            
-            # Crear estructura de directorios primero
-            self.backup_directory_structure()
-            
-            # Respaldar archivos individuales
+
+            # Omitir los archivos sin cambios desde su última subida correcta
+            pending = []
             for local_file, gdrive_path in csv_files:
                 try:
-                    if self.backup_file_to_gdrive(local_file, gdrive_path):
-                        backup_results['successful'] += 1
-                    else:
-                        backup_results['failed'] += 1
-                        backup_results['errors'].append(f"Failed: {local_file.name}")
-                    
-                    # Pequeña pausa para no saturar
-                    time.sleep(1)
-                    
-                except Exception as e:
-                    backup_results['failed'] += 1
-                    backup_results['errors'].append(f"Error {local_file.name}: {str(e)}")
-                    self.logger.error(f"❌ Error respaldando {local_file.name}: {e}")
+                    signature = self._file_signature(local_file)
+                except OSError:
+                    signature = None
+                if signature is None or self._upload_cache.get(str(local_file)) != signature:
+                    pending.append((local_file, gdrive_path, signature))
+            backup_results['skipped'] = len(csv_files) - len(pending)
+            pending_files = [(local_file, gdrive_path) for local_file, gdrive_path, _ in pending]
+
+            failures = {}
+            if pending_files:
+                # Un solo rclone copy para todo el lote; crea las carpetas remotas
+                try:
+                    failures = self._batched_rclone_copy(pending_files)
+                except subprocess.TimeoutExpired:
+                    self.logger.error("⏱️  Timeout en rclone copy del lote")
+                    failures = {
+                        local_file.relative_to(self.data_dir).as_posix(): 'Backup timeout'
+                        for local_file, _ in pending_files
+                    }
+                except OSError as e:
+                    # rclone ausente o no ejecutable
+                    self.logger.error(f"❌ No se pudo ejecutar rclone copy del lote: {e}")
+                    failures = None
+
+                # Si el lote falló por completo, respaldar archivo por archivo
+                if failures is None:
+                    self.logger.info("🔁 Reintentando el respaldo archivo por archivo")
+                    failures = self._per_file_copy(pending_files)
+
+                for local_file, _, signature in pending:
+                    relative_path = local_file.relative_to(self.data_dir).as_posix()
+                    if signature is not None and relative_path not in failures:
+                        self._upload_cache[str(local_file)] = signature
+                self._save_upload_cache()
+
+            # Los archivos sin cambios van en 'skipped', no como subidas
+            backup_results['successful'] = len(pending_files) - len(failures)
+            backup_results['failed'] = len(failures)
+            for path, error in failures.items():
+                backup_results['errors'].append(f"Failed: {path}: {error}")
+                self.logger.error(f"❌ Error respaldando {path}: {error}")
             
             backup_results['end_time'] = datetime.now().isoformat()
-            backup_results['duration_seconds'] = (
-                datetime.fromisoformat(backup_results['end_time']) - 
-                datetime.fromisoformat(backup_results['start_time'])
-            ).total_seconds()
+            backup_results['duration_seconds'] = time.monotonic() - start
             
             # Log resumen
-            success_rate = (backup_results['successful'] / backup_results['total_files']) * 100 if backup_results['total_files'] > 0 else 0
+            success_rate = (backup_results['successful'] / len(pending_files)) * 100 if pending_files else 100.0
             
             self.logger.info(f"📊 Respaldo completado:")
             self.logger.info(f"   Total archivos: {backup_results['total_files']}")
             self.logger.info(f"   Exitosos: {backup_results['successful']}")
             self.logger.info(f"   Fallidos: {backup_results['failed']}")
+            self.logger.info(f"   Sin cambios: {backup_results['skipped']}")
             self.logger.info(f"   Tasa de éxito: {success_rate:.1f}%")
             self.logger.info(f"   Duración: {backup_results['duration_seconds']:.1f}s")
             
@@ -323,29 +915,71 @@ class GoogleDriveBackupManager:
             backup_results['errors'].append(f"Batch error: {str(e)}")
             return backup_results
     
-    def save_backup_history(self, backup_result: Dict):
-        """Guardar historial de respaldos"""
+    # Separadores compactos para los JSON que solo lee el propio programa
+    JSON_SEPARATORS = (',', ':')
+
+    # Respaldos que se conservan en el historial
+    HISTORY_SIZE = 100
+    # Tamaño del diario a partir del cual se reescribe solo con los conservados
+    HISTORY_COMPACT_BYTES = 1_000_000
+
+    def load_backup_history(self) -> deque:
+        """Cargar los últimos respaldos del diario de historial"""
+        history = deque(maxlen=self.HISTORY_SIZE)
         try:
-            # Cargar historial existente
             if self.history_file.exists():
                 with open(self.history_file, 'r', encoding='utf-8') as f:
-                    self.backup_history = json.load(f)
-            
-            # Agregar nuevo respaldo
+                    # Solo se conservan en memoria las últimas líneas
+                    for line in deque(f, maxlen=self.HISTORY_SIZE):
+                        try:
+                            history.append(json.loads(line))
+                        except ValueError:
+                            continue
+            else:
+                # Historial anterior en un único JSON
+                legacy_file = self.history_file.with_suffix('.json')
+                if legacy_file.exists():
+                    with open(legacy_file, 'r', encoding='utf-8') as f:
+                        history.extend(json.load(f))
+        except Exception as e:
+            self.logger.warning(f"⚠️  Error cargando historial: {e}")
+        return history
+
+    def save_backup_history(self, backup_result: Dict):
+        """Guardar historial de respaldos
+
+        Cada respaldo se añade como una línea al diario; el archivo solo se
+        reescribe, con los últimos ``HISTORY_SIZE``, cuando crece demasiado.
+        """
+        try:
             self.backup_history.append(backup_result)
-            
-            # Mantener solo últimos 100 respaldos
-            if len(self.backup_history) > 100:
-                self.backup_history = self.backup_history[-100:]
-            
-            # Guardar historial actualizado
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                json.dump(self.backup_history, f, indent=2, ensure_ascii=False)
-            
+
+            self.history_file.parent.mkdir(exist_ok=True)
+            if not self.history_file.exists():
+                # Primer guardado: escribir también lo cargado del historial
+                # anterior en un único JSON, que deja de leerse en adelante
+                self._compact_history()
+            else:
+                with open(self.history_file, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(backup_result, ensure_ascii=False, separators=self.JSON_SEPARATORS) + '\n')
+
+                if self.history_file.stat().st_size > self.HISTORY_COMPACT_BYTES:
+                    self._compact_history()
+
             self.logger.debug("💾 Historial de respaldos actualizado")
             
         except Exception as e:
             self.logger.warning(f"⚠️  Error guardando historial: {e}")
+
+    def _compact_history(self):
+        """Reescribir el diario de historial con los respaldos en memoria"""
+        tmp_file = self.history_file.with_suffix('.jsonl.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.writelines(
+                json.dumps(entry, ensure_ascii=False, separators=self.JSON_SEPARATORS) + '\n'
+                for entry in self.backup_history
+            )
+        os.replace(tmp_file, self.history_file)
     
     def run_backup_now(self) -> Dict:
         """Ejecutar respaldo inmediato"""
@@ -360,7 +994,7 @@ class GoogleDriveBackupManager:
                 }
             
             # Obtener archivos para respaldar
-            csv_files = self.get_csv_files_to_backup()
+            csv_files, _ = self._enumerate()
             
             if not csv_files:
                 self.logger.info("📄 No hay archivos CSV para respaldar")
@@ -371,8 +1005,11 @@ class GoogleDriveBackupManager:
                 }
             
             # Realizar respaldo
+            started = time.time()
             backup_result = self.perform_backup_batch(csv_files)
             backup_result['success'] = backup_result['failed'] == 0
+            if backup_result['success']:
+                self._save_last_sync(started)
             
             # Guardar en historial
             self.save_backup_history(backup_result)
@@ -399,28 +1036,12 @@ class GoogleDriveBackupManager:
             
             while self.backup_running:
                 try:
-                    # Verificar si hay archivos nuevos
-                    csv_files = self.get_csv_files_to_backup()
-                    
-                    if csv_files:
-                        # Filtrar solo archivos modificados recientemente
-                        recent_files = []
-                        cutoff_time = datetime.now() - timedelta(minutes=self.backup_interval // 60 + 5)
-                        
-                        for local_file, gdrive_path in csv_files:
-                            try:
-                                file_mtime = datetime.fromtimestamp(local_file.stat().st_mtime)
-                                if file_mtime > cutoff_time:
-                                    recent_files.append((local_file, gdrive_path))
-                            except:
-                                pass
-                        
-                        if recent_files:
-                            self.logger.info(f"☁️  Respaldando {len(recent_files)} archivos nuevos/modificados")
-                            backup_result = self.perform_backup_batch(recent_files)
-                            self.save_backup_history(backup_result)
-                        else:
-                            self.logger.debug("📄 No hay archivos nuevos para respaldar")
+                    # rclone selecciona los archivos nuevos/modificados
+                    backup_result = self._incremental_sync()
+                    if backup_result['total_files']:
+                        self.save_backup_history(backup_result)
+                    else:
+                        self.logger.debug("📄 No hay archivos nuevos para respaldar")
                     
                     # Esperar siguiente intervalo
                     time.sleep(self.backup_interval)
@@ -445,6 +1066,8 @@ class GoogleDriveBackupManager:
         
         if self.backup_thread:
             self.backup_thread.join(timeout=30)
+
+        self._stop_rcd()
         
         self.logger.info("⏹️  Respaldo automático detenido")
     
@@ -452,7 +1075,7 @@ class GoogleDriveBackupManager:
         """Obtener estado actual del sistema de respaldo"""
         try:
             # Estadísticas básicas
-            csv_files = self.get_csv_files_to_backup()
+            csv_files, total_bytes = self._enumerate()
             
             # Último respaldo
             last_backup = None
@@ -466,8 +1089,13 @@ class GoogleDriveBackupManager:
                 'backup_running': self.backup_running,
                 'rclone_configured': rclone_ok,
                 'total_csv_files': len(csv_files),
+                'total_csv_bytes': total_bytes,
                 'backup_interval_seconds': self.backup_interval,
                 'last_backup': last_backup,
+                'last_successful_sync': (
+                    datetime.fromtimestamp(self._last_sync).isoformat()
+                    if self._last_sync is not None else None
+                ),
                 'backup_history_count': len(self.backup_history),
                 'timestamp': datetime.now().isoformat()
             }
@@ -484,6 +1112,7 @@ def main():
     
     parser = argparse.ArgumentParser(description='Google Drive Backup Manager')
     parser.add_argument('--backup-now', action='store_true', help='Ejecutar respaldo inmediato')
+    parser.add_argument('--backup-dirs', action='store_true', help='Respaldar cada website/operación en paralelo')
     parser.add_argument('--start-auto', action='store_true', help='Iniciar respaldo automático')
     parser.add_argument('--status', action='store_true', help='Mostrar estado del sistema')
     parser.add_argument('--list-files', action='store_true', help='Listar archivos para respaldar')
@@ -504,6 +1133,19 @@ def main():
         else:
             print(f"❌ Error en respaldo: {result.get('error', 'Unknown')}")
     
+    elif args.backup_dirs:
+        print("☁️  Respaldando directorios website/operación...")
+        result = backup_manager.backup_all_websites()
+        backup_manager.save_backup_history(result)
+
+        if result['success']:
+            print(f"✅ Respaldo completado: {len(result['shards'])} directorios")
+            print(f"   Archivos respaldados: {result['successful']}")
+        else:
+            print(f"❌ Directorios con error: {result['failed']}")
+            for error in result['errors']:
+                print(f"   {error}")
+    
     elif args.start_auto:
         print("🔄 Iniciando respaldo automático...")
         backup_manager.start_automatic_backup()
@@ -538,7 +1180,7 @@ def main():
             print("❌ Error en configuración rclone")
     
     else:
-        print("Use --backup-now, --start-auto, --status, --list-files, o --test-rclone")
+        print("Use --backup-now, --backup-dirs, --start-auto, --status, --list-files, o --test-rclone")
 
 if __name__ == "__main__":
     main()
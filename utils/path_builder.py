@@ -4,6 +4,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime
 import calendar
+import os
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -16,6 +18,28 @@ class PathInfo:
     run_number: str
 
 
+@lru_cache(maxsize=1)
+def _project_root() -> Path:
+    """Return the resolved project root (resolved once per process)."""
+    return Path(__file__).resolve().parent.parent
+
+
+@lru_cache(maxsize=256)
+def _base_dir(
+    pagina_web: str, ciudad: str, operacion: str, producto: str, month_year: str
+) -> Path:
+    """Return the month directory that holds the runs of a scraping target."""
+    return (
+        _project_root()
+        / "data"
+        / pagina_web
+        / ciudad
+        / operacion
+        / producto
+        / month_year
+    )
+
+
 def build_path(pagina_web: str, ciudad: str, operacion: str, producto: str) -> PathInfo:
     """Build the directory and file name for a scraping run.
 
@@ -29,26 +53,24 @@ def build_path(pagina_web: str, ciudad: str, operacion: str, producto: str) -> P
         PathInfo containing the final directory, default file name, month-year
         string and run number.
     """
-    project_root = Path(__file__).resolve().parent.parent
-
     now = datetime.now()
     month_abbr = calendar.month_abbr[now.month]
     year_short = str(now.year)[-2:]
     month_year = f"{month_abbr}{year_short}"
 
-    base_dir = (
-        project_root
-        / "data"
-        / pagina_web
-        / ciudad
-        / operacion
-        / producto
-        / month_year
-    )
+    base_dir = _base_dir(pagina_web, ciudad, operacion, producto, month_year)
 
-    run = 1
-    while (base_dir / f"{run:02d}").exists():
-        run += 1
+    # One directory read instead of a stat per existing run
+    highest = 0
+    try:
+        with os.scandir(base_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if len(name) == 2 and name.isdigit() and entry.is_dir(follow_symlinks=False):
+                    highest = max(highest, int(name))
+    except FileNotFoundError:
+        pass
+    run = highest + 1
     run_str = f"{run:02d}"
 
     final_dir = base_dir / run_str
@@ -1,8 +1,13 @@
 """Utility helpers for working with URL columns in CSV rows."""
 
 import csv
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Parsed CSV files keyed by path, valid while (mtime_ns, size) is unchanged
+_CSV_CACHE: Dict[str, Tuple[int, int, List[Dict[str, str]]]] = {}
 
 
 def extract_url_column(row: Any) -> str:
@@ -38,13 +43,37 @@ def extract_url_column(row: Any) -> str:
     return ""
 
 
+def _resolve_url_key(fieldnames: Iterable[str]) -> Optional[str]:
+    """Return the first URL column name present in ``fieldnames``, if any."""
+    names = set(fieldnames)
+    for key in ("URL", "Url", "url"):
+        if key in names:
+            return key
+    return None
+
+
+def _row_url(row: Dict[str, str], url_key: Optional[str]) -> str:
+    """Like :func:`extract_url_column` with the URL column resolved upfront.
+
+    Rows whose ``url_key`` value is empty go through the tolerant path, so
+    the result is always the same as ``extract_url_column(row)``.
+    """
+    if url_key is not None:
+        value = row[url_key]
+        if value:
+            return value.strip()
+    return extract_url_column(row)
+
+
 def load_urls_from_csv(path: str) -> List[Dict[str, str]]:
     """Read URL records from a CSV file.
 
     The CSV is expected to contain a header row. All columns are returned for
     each entry, but rows without a URL value are skipped.
     The URL column name is resolved using :func:`extract_url_column`
-    to allow flexible headers.
+    to allow flexible headers. Parsed files are cached until their
+    modification time or size changes; each call returns its own copies of
+    the row dictionaries, so callers may modify them.
 
     Args:
         path: Path to the CSV file.
@@ -54,16 +83,95 @@ def load_urls_from_csv(path: str) -> List[Dict[str, str]]:
         contain a URL.
     """
 
+    return [dict(row) for row in _cached_rows(path)]
+
+
+def _cached_rows(path: str) -> List[Dict[str, str]]:
+    """Return the cached rows of ``path``, parsing the file when it changed.
+
+    The returned list and dictionaries are shared and must not be modified.
+    """
+    st = os.stat(path)
+    key = os.fspath(path)
+    cached = _CSV_CACHE.get(key)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+
     records: List[Dict[str, str]] = []
     with open(path, newline="", encoding="utf-8") as csvfile:
         reader = csv.DictReader(csvfile)
+        url_key = _resolve_url_key(reader.fieldnames or [])
         for row in reader:
-            if extract_url_column(row):
+            if _row_url(row, url_key):
                 records.append(row)
 
+    _CSV_CACHE[key] = (st.st_mtime_ns, st.st_size, records)
     return records
 
 
+def _site_urls_with_pandas(path: Path, site_lower: str) -> Optional[List[str]]:
+    """Return the URLs of ``site_lower`` in ``path`` parsed with pandas.
+
+    Only the ``PaginaWeb`` and URL columns are read and the site filter runs
+    vectorized. The URL is taken with the same precedence as
+    :func:`extract_url_column` (``URL``, ``Url``, ``url``, then the fifth
+    column). Returns ``None`` when pandas is missing or the file has no
+    ``PaginaWeb`` column, so the caller can use the ``csv`` module instead.
+    """
+    try:
+        import pandas as pd
+    except ImportError:
+        return None
+
+    header = pd.read_csv(path, nrows=0, encoding="utf-8").columns.tolist()
+    if "PaginaWeb" not in header:
+        return None
+    url_columns = [key for key in ("URL", "Url", "url") if key in header]
+    if len(header) > 4 and header[4] not in url_columns:
+        url_columns.append(header[4])
+    if not url_columns:
+        return []
+
+    frame = pd.read_csv(
+        path,
+        usecols=["PaginaWeb", *url_columns],
+        dtype=str,
+        keep_default_na=False,
+        encoding="utf-8",
+    )
+    frame = frame[frame["PaginaWeb"].str.strip().str.lower() == site_lower]
+
+    urls = frame[url_columns[0]]
+    for column in url_columns[1:]:
+        urls = urls.mask(urls == "", frame[column])
+    urls = urls.str.strip()
+    return urls[urls != ""].tolist()
+
+
+def _site_urls_in_file(csv_file: Path, site_lower: str) -> List[str]:
+    """Return the URLs of ``site_lower`` in one CSV file (empty on errors)."""
+    try:
+        site_urls = _site_urls_with_pandas(csv_file, site_lower)
+    except Exception:
+        site_urls = None
+    if site_urls is not None:
+        return site_urls
+
+    try:
+        rows = _cached_rows(str(csv_file))
+    except Exception:
+        return []
+
+    urls: List[str] = []
+    url_key = _resolve_url_key(rows[0]) if rows else None
+    for row in rows:
+        if (row.get("PaginaWeb") or "").strip().lower() == site_lower:
+            url_val = _row_url(row, url_key)
+            if url_val:
+                urls.append(url_val)
+    return urls
+
+
 def load_urls_for_site(urls_dir: str, site: str) -> List[str]:
     """Load all URLs for a given site from CSV files in a directory.
 
@@ -81,17 +189,9 @@ def load_urls_for_site(urls_dir: str, site: str) -> List[str]:
         return []
 
     site_lower = site.lower()
-    urls: List[str] = []
-
-    for csv_file in directory.glob("*.csv"):
-        try:
-            rows = load_urls_from_csv(str(csv_file))
-        except Exception:
-            continue
-        for row in rows:
-            if (row.get("PaginaWeb") or "").strip().lower() == site_lower:
-                url_val = extract_url_column(row)
-                if url_val:
-                    urls.append(url_val)
+    csv_files = list(directory.glob("*.csv"))
 
-    return urls
+    # Files are read concurrently; map() keeps the directory order
+    with ThreadPoolExecutor(max_workers=min(8, len(csv_files) or 1)) as executor:
+        per_file = executor.map(lambda path: _site_urls_in_file(path, site_lower), csv_files)
+        return [url for file_urls in per_file for url in file_urls]